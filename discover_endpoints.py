@@ -6,34 +6,140 @@ Also browses ArcGIS service directories to find renamed services.
 
 Usage:
     python3 discover_endpoints.py
+    python3 discover_endpoints.py --only tceq --only usfws
+    python3 discover_endpoints.py --existing discovered_endpoints.json
+    python3 discover_endpoints.py --only substations --candidates extra_urls.txt
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NameResolutionError, NewConnectionError
+from urllib3.util.retry import Retry
+import argparse
+import io
 import json
+import os
+import re
 import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+try:
+    import orjson  # optional — ~3x faster on the large ArcGIS directory bodies
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 requests.packages.urllib3.disable_warnings()
-TIMEOUT = 20
+TIMEOUT = 20  # read timeout
+CONNECT_TIMEOUT = 5  # kept short so an unreachable host fails fast without cutting off a slow one
+MAX_WORKERS = 16
+OUTPUT_FILE = "discovered_endpoints.json"
+MAX_PER_HOST = 4  # stay under ArcGIS/EPA rate limiters while other hosts run in parallel
+
+# One pooled session for every probe — keeps TCP/TLS connections alive across
+# the many calls to the same ArcGIS / FEMA / EPA hosts
+SESSION = requests.Session()
+SESSION.verify = False
+# Transient failures (resets, 429/5xx from ArcGIS) are retried with jittered
+# exponential backoff so a blip doesn't mark a working endpoint dead
+_retry = Retry(
+    total=3,
+    backoff_factor=1.0,
+    backoff_jitter=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET", "HEAD"],
+)
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_retry)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Shared worker pool — directory browses are submitted alongside candidate
+# probes so the whole run overlaps its network waits
+EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+_host_slots = defaultdict(lambda: threading.Semaphore(MAX_PER_HOST))
+_host_slots_lock = threading.Lock()
+
+
+def _get(url, **kwargs):
+    """SESSION.get, holding one of the host's MAX_PER_HOST slots for the request."""
+    with _host_slots_lock:
+        slot = _host_slots[urlparse(url).netloc]
+    with slot:
+        return SESSION.get(url, **kwargs)
+
+
+DEAD_HOSTS = set()
+_live_hosts = set()
+
+
+def _unreachable(exc):
+    """True if a ConnectionError came from a DNS failure or a refused connection."""
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    if isinstance(reason, NameResolutionError):
+        return True
+    return isinstance(reason, NewConnectionError) and isinstance(reason.__cause__, ConnectionRefusedError)
+
+
+def _host_alive(url):
+    """
+    Cheap HEAD check before the full probe, through SESSION so transient
+    failures get its retries. Only hosts that fail DNS or refuse the
+    connection land in DEAD_HOSTS and are skipped for the rest of the run;
+    resets, timeouts and hosts that reject HEAD are left to the probe itself.
+    """
+    host = urlparse(url).netloc
+    if host in DEAD_HOSTS:
+        return False
+    if host in _live_hosts:
+        return True
+    try:
+        SESSION.head(url, timeout=(CONNECT_TIMEOUT, 5), allow_redirects=True)
+    except requests.exceptions.ConnectionError as e:
+        if _unreachable(e):
+            DEAD_HOSTS.add(host)
+            return False
+    except requests.exceptions.RequestException:
+        pass  # up but unhelpful — let the probe decide
+    _live_hosts.add(host)
+    return True
+
+
+def warm_hosts(urls):
+    """
+    Run the _host_alive HEAD check on every host once, in parallel, before
+    any section runs. Dead hosts are known up front, and since the HEADs go
+    through SESSION each live host is left with an open keep-alive
+    connection (TCP + TLS done) in the pool for its first probe to reuse.
+    """
+    return dict(zip(urls, EXECUTOR.map(_host_alive, urls)))
 
 
 def try_arcgis_service(url, test_where="1=1", label=""):
     """Test an ArcGIS service URL. Returns (works, detail)."""
+    if not _host_alive(url):
+        return False, f"Host unreachable: {urlparse(url).netloc}"
     try:
         # Check metadata
-        r = requests.get(f"{url}?f=json", timeout=TIMEOUT, verify=False)
-        r.raise_for_status()
-        meta = r.json()
+        meta = _get_json(f"{url}?f=json")
         if "error" in meta:
             return False, f"Error: {meta['error'].get('message', '')}"
 
         fields = [f["name"] for f in meta.get("fields", [])]
 
-        # Try a query
-        qr = requests.get(f"{url}/query", params={
-            "where": test_where, "outFields": "*", "f": "geojson", "resultRecordCount": 2
-        }, timeout=TIMEOUT, verify=False)
-        qdata = qr.json()
+        # Try a query — only the feature count is used, so skip the geometry
+        qr = _get(f"{url}/query", params={
+            "where": test_where, "outFields": "*", "f": "geojson", "resultRecordCount": 2,
+            "returnGeometry": "false",
+        }, timeout=(CONNECT_TIMEOUT, TIMEOUT))
+        qdata = _json_loads(qr.content)
         fc = len(qdata.get("features", []))
 
         return True, f"{len(fields)} fields, {fc} features | Fields: {', '.join(fields[:10])}"
@@ -43,390 +149,527 @@ def try_arcgis_service(url, test_where="1=1", label=""):
 
 def try_rest_api(url, label=""):
     """Test a generic REST endpoint."""
+    if not _host_alive(url):
+        return False, f"Host unreachable: {urlparse(url).netloc}"
     try:
-        r = requests.get(url, timeout=TIMEOUT, verify=False)
+        r = _get(url, timeout=(CONNECT_TIMEOUT, TIMEOUT))
         r.raise_for_status()
-        data = r.json() if 'json' in r.headers.get('content-type', '') else r.text[:200]
+        data = _json_loads(r.content) if 'json' in r.headers.get('content-type', '') else r.text[:200]
         count = len(data) if isinstance(data, list) else 1
         return True, f"HTTP {r.status_code}, got {count} records"
     except Exception as e:
         return False, str(e)[:100]
 
 
+@lru_cache(maxsize=128)
+def _get_json(url):
+    """
+    GET a URL and decode its JSON body. Memoized per URL so repeated
+    directory lookups within a run cost one request; callers must not
+    mutate the returned dict.
+    """
+    r = _get(url, timeout=(CONNECT_TIMEOUT, TIMEOUT))
+    r.raise_for_status()
+    return _json_loads(r.content)
+
+
 def browse_arcgis_directory(server_url, search_terms):
     """Browse an ArcGIS services directory and find matching services."""
     try:
-        r = requests.get(f"{server_url}?f=json", timeout=TIMEOUT, verify=False)
-        r.raise_for_status()
-        data = r.json()
+        data = _get_json(f"{server_url}?f=json")
         services = data.get("services", [])
         folders = data.get("folders", [])
 
+        pattern = re.compile("|".join(map(re.escape, search_terms)), re.IGNORECASE)
         matches = []
         all_names = []
         for svc in services:
             name = svc.get("name", "")
             stype = svc.get("type", "FeatureServer")
             all_names.append(f"{name} ({stype})")
-            for term in search_terms:
-                if term.lower() in name.lower():
-                    matches.append((name, stype))
-                    break
+            if pattern.search(name):
+                matches.append((name, stype))
 
         return True, matches, all_names, folders
     except Exception as e:
         return False, [], [], []
 
 
-def main():
-    print("=" * 70)
-    print("BESS Site Scout — Endpoint Discovery")
-    print(f"Timestamp: {datetime.now().isoformat()}")
-    print("=" * 70)
-
-    results = {}
-
-    # ===================================================================
-    # 1. HIFLD SUBSTATIONS — try multiple candidates
-    # ===================================================================
-    print("\n" + "=" * 50)
-    print("[1] HIFLD SUBSTATIONS")
-    print("=" * 50)
-
-    sub_candidates = [
-        ("services2 — US_Electric_Substations",
-         "https://services2.arcgis.com/FiaPA4ga0iQKduv3/arcgis/rest/services/US_Electric_Substations/FeatureServer/0"),
-        ("services2 — Electric_Substations",
-         "https://services2.arcgis.com/FiaPA4ga0iQKduv3/arcgis/rest/services/Electric_Substations/FeatureServer/0"),
-        ("services2 — US_Electric_Substations_1",
-         "https://services2.arcgis.com/FiaPA4ga0iQKduv3/arcgis/rest/services/US_Electric_Substations_1/FeatureServer/0"),
-        ("NASA NCCS — hifld_open energy (layer 2)",
-         "https://maps.nccs.nasa.gov/mapping/rest/services/hifld_open/energy/FeatureServer/2"),
-        ("NASA NCCS — hifld_open energy (layer 0)",
-         "https://maps.nccs.nasa.gov/mapping/rest/services/hifld_open/energy/FeatureServer/0"),
-        ("NASA NCCS — hifld_open energy (layer 1)",
-         "https://maps.nccs.nasa.gov/mapping/rest/services/hifld_open/energy/FeatureServer/1"),
-        ("Rutgers MARCO — MapServer layer 0",
-         "https://oceandata.rad.rutgers.edu/arcgis/rest/services/RenewableEnergy/HIFLD_Electric_SubstationsTransmissionLines/MapServer/0"),
+@dataclass
+class Probe:
+    """
+    One candidate endpoint. service_key is the results key it fills;
+    kind is "arcgis" (metadata + test query) or "rest" (plain GET).
+    """
+    service_key: str
+    label: str
+    url: str
+    where: str = "1=1"
+    kind: str = "arcgis"
+
+
+@dataclass
+class EndpointResult:
+    """A working endpoint, as written to discovered_endpoints.json."""
+    url: str
+    label: str = ""
+    base: Optional[str] = None  # service root, recorded for EPA Envirofacts
+
+    def to_dict(self) -> dict:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+SERVICES2_ROOT = "https://services2.arcgis.com/FiaPA4ga0iQKduv3/arcgis/rest/services/"
+TCEQ_ROOT = "https://services.arcgis.com/KTcxiTD9dsQw4r7Z/arcgis/rest/services/"
+USFWS_ROOT = "https://services.arcgis.com/QVENGdaPbd4LUkLV/arcgis/rest/services/"
+NCCS_ENERGY = "https://maps.nccs.nasa.gov/mapping/rest/services/hifld_open/energy/FeatureServer"
+FEMA_BASES = [
+    "https://hazards.fema.gov/arcgis/rest/services/public/NFHL/MapServer",
+    "https://hazards.fema.gov/gis/nfhl/rest/services/public/NFHL/MapServer",
+]
+ECHO_QUERY = "get_facilities?output=JSON&p_st=TX&p_lat=30.628&p_long=-96.334&p_radius=1"
+
+# Known candidates, in preference order within each service_key
+PROBES = [
+    # 1. HIFLD substations
+    Probe("substations", "services2 — US_Electric_Substations",
+          f"{SERVICES2_ROOT}US_Electric_Substations/FeatureServer/0", "STATE='TX'"),
+    Probe("substations", "services2 — Electric_Substations",
+          f"{SERVICES2_ROOT}Electric_Substations/FeatureServer/0", "STATE='TX'"),
+    Probe("substations", "services2 — US_Electric_Substations_1",
+          f"{SERVICES2_ROOT}US_Electric_Substations_1/FeatureServer/0", "STATE='TX'"),
+    Probe("substations", "NASA NCCS — hifld_open energy (layer 2)", f"{NCCS_ENERGY}/2", "STATE='TX'"),
+    Probe("substations", "NASA NCCS — hifld_open energy (layer 0)", f"{NCCS_ENERGY}/0", "STATE='TX'"),
+    Probe("substations", "NASA NCCS — hifld_open energy (layer 1)", f"{NCCS_ENERGY}/1", "STATE='TX'"),
+    Probe("substations", "Rutgers MARCO — MapServer layer 0",
+          "https://oceandata.rad.rutgers.edu/arcgis/rest/services/RenewableEnergy/HIFLD_Electric_SubstationsTransmissionLines/MapServer/0",
+          "STATE='TX'"),
+    # 2. HIFLD transmission lines (already working, just confirm)
+    Probe("transmission_lines", "services2 — US_Electric_Power_Transmission_Lines",
+          f"{SERVICES2_ROOT}US_Electric_Power_Transmission_Lines/FeatureServer/0", "VOLT_CLASS='345'"),
+    # 3. FEMA NFHL
+    Probe("fema_nfhl", "New path — /arcgis/rest/ layer 28", f"{FEMA_BASES[0]}/28"),
+    Probe("fema_nfhl", "New path — /arcgis/rest/ layer 20", f"{FEMA_BASES[0]}/20"),
+    Probe("fema_nfhl", "Old path — /gis/nfhl/rest/ layer 28", f"{FEMA_BASES[1]}/28"),
+    Probe("fema_nfhl", "Old path — /gis/nfhl/rest/ layer 20", f"{FEMA_BASES[1]}/20"),
+    # 4. EPA Envirofacts
+    Probe("epa_envirofacts", "New domain — data.epa.gov (lowercase)",
+          "https://data.epa.gov/efservice/sems.sems_active_sites/state_code/TX/rows/0:2/json", kind="rest"),
+    Probe("epa_envirofacts", "New domain — data.epa.gov (uppercase)",
+          "https://data.epa.gov/efservice/SEMS.SEMS_ACTIVE_SITES/STATE_CODE/TX/rows/0:2/JSON", kind="rest"),
+    Probe("epa_envirofacts", "New domain — data.epa.gov (no prefix)",
+          "https://data.epa.gov/efservice/SEMS_ACTIVE_SITES/STATE_CODE/TX/rows/0:2/JSON", kind="rest"),
+    Probe("epa_envirofacts", "Old domain — enviro.epa.gov",
+          "https://enviro.epa.gov/enviro/efservice/sems.sems_active_sites/state_code/TX/rows/0:2/json", kind="rest"),
+    # 5. EPA ECHO
+    Probe("epa_echo", "ofmpub — echo13_rest_services",
+          f"https://ofmpub.epa.gov/echo/echo13_rest_services.{ECHO_QUERY}", kind="rest"),
+    Probe("epa_echo", "ofmpub — echo_rest_services",
+          f"https://ofmpub.epa.gov/echo/echo_rest_services.{ECHO_QUERY}", kind="rest"),
+    Probe("epa_echo", "echodata — echo_rest_services",
+          f"https://echodata.epa.gov/echo/echo_rest_services.{ECHO_QUERY}", kind="rest"),
+    Probe("epa_echo", "Old — echo.epa.gov",
+          f"https://echo.epa.gov/api/echo_rest_services.{ECHO_QUERY}", kind="rest"),
+    # 6. TCEQ — only probed if the directory can't be browsed
+    Probe("tceq_LPST_Points", "LPST_Points", f"{TCEQ_ROOT}LPST_Points/FeatureServer/0"),
+    Probe("tceq_LPST", "LPST", f"{TCEQ_ROOT}LPST/FeatureServer/0"),
+    Probe("tceq_PetroleumStorageTanks", "PetroleumStorageTanks", f"{TCEQ_ROOT}PetroleumStorageTanks/FeatureServer/0"),
+    Probe("tceq_PST", "PST", f"{TCEQ_ROOT}PST/FeatureServer/0"),
+    # 7. USFWS
+    Probe("usfws_nwi", "USGS/FWS MapServer layer 0",
+          "https://fwspublicservices.wim.usgs.gov/wetlandsmapservice/rest/services/Wetlands/MapServer/0"),
+    Probe("usfws_critical_habitat", "ECOS Critical Habitat",
+          f"{USFWS_ROOT}FWS_HQ_ES_Critical_Habitat/FeatureServer/0"),
+    Probe("usfws_critical_habitat", "ECOS CH (v2)", f"{USFWS_ROOT}Critical_Habitat/FeatureServer/0"),
+    Probe("usfws_critical_habitat", "FWS ECOS GIS", f"{USFWS_ROOT}USFWS_Critical_Habitat/FeatureServer/0"),
+]
+
+
+# service_key prefixes the sections pass to probes_for. The fallback-only
+# ones are probed just when the section's directory search comes up empty.
+PROBED_PREFIXES = (
+    "substations", "transmission_lines", "fema_nfhl", "epa_envirofacts",
+    "epa_echo", "tceq_", "usfws_nwi", "usfws_critical_habitat",
+)
+FALLBACK_ONLY_PREFIXES = ("tceq_", "usfws_critical_habitat")
+
+
+def probes_for(prefix):
+    """Table entries whose service_key starts with prefix, in table order."""
+    return [p for p in PROBES if p.service_key.startswith(prefix)]
+
+
+def drop_unlisted_services(probes, server_url):
+    """
+    Split probes on server_url into those whose service the directory lists
+    and those it doesn't, so only the former get probed. Probes on other
+    servers are kept; if the directory can't be read, nothing is dropped.
+    Returns (kept, dropped).
+    """
+    try:
+        data = _get_json(f"{server_url}?f=json")
+    except Exception:
+        return probes, []
+    listed = {svc.get("name", "").lower() for svc in data.get("services", [])}
+
+    kept, dropped = [], []
+    for p in probes:
+        if p.url.startswith(server_url) and p.url[len(server_url):].split("/")[0].lower() not in listed:
+            dropped.append(p)
+        else:
+            kept.append(p)
+    return kept, dropped
+
+
+def _run_probe(probe):
+    """Probe a single candidate. Returns (ok, detail)."""
+    if probe.kind == "rest":
+        return try_rest_api(probe.url)
+    return try_arcgis_service(probe.url, probe.where)
+
+
+def run_probes(probes, results, out):
+    """
+    Probe candidates concurrently, print each outcome in table order, and
+    record the first working probe per service_key in results. Keys already
+    present aren't probed at all, so a known-good endpoint is never replaced.
+    Returns the service_keys recorded by this call.
+    """
+    for key in dict.fromkeys(p.service_key for p in probes if p.service_key in results):
+        print(f"  ⏭️  {key} already known, not re-probed", file=out)
+    probes = [p for p in probes if p.service_key not in results]
+    futures = [EXECUTOR.submit(_run_probe, p) for p in probes]
+    recorded = []
+    for p, future in zip(probes, futures):
+        ok, detail = future.result()
+        print(f"  {'✅' if ok else '❌'} {p.label}", file=out)
+        print(f"     URL: {p.url}", file=out)
+        print(f"     {detail}", file=out)
+        if ok and p.service_key not in results:
+            results[p.service_key] = EndpointResult(p.url, p.label)
+            recorded.append(p.service_key)
+    return recorded
+
+
+def _directory_probes(service_key, server_url, matches, where="1=1", label_prefix=""):
+    """Probes for services found by browse_arcgis_directory."""
+    return [
+        Probe(service_key.format(name=name), f"{label_prefix}{name}",
+              f"{server_url}{name}/{stype}/0", where)
+        for name, stype in matches
     ]
 
-    found_subs = False
-    for label, url in sub_candidates:
-        ok, detail = try_arcgis_service(url, "STATE='TX'")
-        icon = "✅" if ok else "❌"
-        print(f"  {icon} {label}")
-        print(f"     URL: {url}")
-        print(f"     {detail}")
-        if ok and not found_subs:
-            results["substations"] = {"url": url, "label": label}
-            found_subs = True
 
-    # Browse services2 directory
-    print("\n  📂 Browsing services2.arcgis.com directory...")
-    ok, matches, all_names, folders = browse_arcgis_directory(
-        "https://services2.arcgis.com/FiaPA4ga0iQKduv3/arcgis/rest/services/",
-        ["substation", "electric_sub", "US_Electric_Sub"]
+def save_results(results: Dict[str, EndpointResult], timestamp: str):
+    """
+    Write the results found so far to OUTPUT_FILE. Called after every section
+    so an interrupted run keeps what it already discovered; the temp file +
+    os.replace keeps the JSON valid if the write itself is interrupted.
+    """
+    tmp = f"{OUTPUT_FILE}.tmp"
+    with open(tmp, "w") as f:
+        payload = {"timestamp": timestamp, "results": {k: r.to_dict() for k, r in results.items()}}
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, OUTPUT_FILE)
+
+
+def discover_substations(out, known):
+    """HIFLD substations — hand-listed candidates, then the services2 directory and NASA NCCS layers."""
+    results = dict(known)
+    print("\n" + "=" * 50, file=out)
+    print("[1] HIFLD SUBSTATIONS", file=out)
+    print("=" * 50, file=out)
+
+    # Start the NASA browse now so it overlaps the candidate probes
+    nccs_dir = EXECUTOR.submit(_get_json, f"{NCCS_ENERGY}?f=json")
+
+    # The services2 directory lists every service it hosts — guessed names
+    # that aren't in it are skipped instead of probed
+    sub_probes, unlisted = drop_unlisted_services(probes_for("substations"), SERVICES2_ROOT)
+    services2_dir = EXECUTOR.submit(
+        browse_arcgis_directory, SERVICES2_ROOT,
+        ["substation", "electric_sub", "US_Electric_Sub"],
     )
+    for p in unlisted:
+        print(f"  ⏭️  {p.label} — not in directory, skipped", file=out)
+    run_probes(sub_probes, results, out)
+
+    # Browse services2 directory
+    print("\n  📂 Browsing services2.arcgis.com directory...", file=out)
+    ok, matches, all_names, folders = services2_dir.result()
     if ok:
         if matches:
-            print(f"  🔍 Substation matches: {matches}")
-            for name, stype in matches:
-                url = f"https://services2.arcgis.com/FiaPA4ga0iQKduv3/arcgis/rest/services/{name}/{stype}/0"
-                ok2, detail2 = try_arcgis_service(url, "STATE='TX'")
-                if ok2 and not found_subs:
-                    results["substations"] = {"url": url, "label": f"Discovered: {name}"}
-                    found_subs = True
-                    print(f"  ✅ DISCOVERED: {url}")
+            print(f"  🔍 Substation matches: {matches}", file=out)
+            if "substations" not in results:
+                run_probes(
+                    _directory_probes("substations", SERVICES2_ROOT, matches, "STATE='TX'", "Discovered: "),
+                    results, out,
+                )
         else:
-            print(f"  ⚠️  No 'substation' match. All {len(all_names)} services:")
+            print(f"  ⚠️  No 'substation' match. All {len(all_names)} services:", file=out)
             for n in sorted(all_names):
-                print(f"     - {n}")
+                print(f"     - {n}", file=out)
         if folders:
-            print(f"  📁 Folders: {folders}")
+            print(f"  📁 Folders: {folders}", file=out)
 
     # Also browse NASA NCCS
-    print("\n  📂 Browsing NASA NCCS hifld_open energy layers...")
+    print("\n  📂 Browsing NASA NCCS hifld_open energy layers...", file=out)
     try:
-        r = requests.get("https://maps.nccs.nasa.gov/mapping/rest/services/hifld_open/energy/FeatureServer?f=json", timeout=TIMEOUT, verify=False)
-        meta = r.json()
+        meta = nccs_dir.result()
         layers = meta.get("layers", [])
         for layer in layers:
-            print(f"     Layer {layer['id']}: {layer['name']}")
+            print(f"     Layer {layer['id']}: {layer['name']}", file=out)
     except Exception as e:
-        print(f"     Could not browse: {e}")
-
-    if not found_subs:
-        print("\n  ❌ NO WORKING SUBSTATIONS ENDPOINT FOUND")
-
-    # ===================================================================
-    # 2. HIFLD TRANSMISSION LINES (already working, just confirm)
-    # ===================================================================
-    print("\n" + "=" * 50)
-    print("[2] HIFLD TRANSMISSION LINES")
-    print("=" * 50)
-    url = "https://services2.arcgis.com/FiaPA4ga0iQKduv3/arcgis/rest/services/US_Electric_Power_Transmission_Lines/FeatureServer/0"
-    ok, detail = try_arcgis_service(url, "VOLT_CLASS='345'")
-    print(f"  {'✅' if ok else '❌'} {url}")
-    print(f"     {detail}")
-    if ok:
-        results["transmission_lines"] = {"url": url}
-
-    # ===================================================================
-    # 3. FEMA NFHL — try new URL structure
-    # ===================================================================
-    print("\n" + "=" * 50)
-    print("[3] FEMA NFHL FLOOD ZONES")
-    print("=" * 50)
-
-    fema_candidates = [
-        ("New path — /arcgis/rest/ layer 28",
-         "https://hazards.fema.gov/arcgis/rest/services/public/NFHL/MapServer/28"),
-        ("New path — /arcgis/rest/ layer 20",
-         "https://hazards.fema.gov/arcgis/rest/services/public/NFHL/MapServer/20"),
-        ("Old path — /gis/nfhl/rest/ layer 28",
-         "https://hazards.fema.gov/gis/nfhl/rest/services/public/NFHL/MapServer/28"),
-        ("Old path — /gis/nfhl/rest/ layer 20",
-         "https://hazards.fema.gov/gis/nfhl/rest/services/public/NFHL/MapServer/20"),
-    ]
+        print(f"     Could not browse: {e}", file=out)
+
+    if "substations" not in results:
+        print("\n  ❌ NO WORKING SUBSTATIONS ENDPOINT FOUND", file=out)
+
+    return results
+
+
+def discover_transmission(out, known):
+    """HIFLD transmission lines — confirm the known endpoint still answers."""
+    results = dict(known)
+    print("\n" + "=" * 50, file=out)
+    print("[2] HIFLD TRANSMISSION LINES", file=out)
+    print("=" * 50, file=out)
+    run_probes(probes_for("transmission_lines"), results, out)
 
-    found_fema = False
-    for label, url in fema_candidates:
-        ok, detail = try_arcgis_service(url)
-        icon = "✅" if ok else "❌"
-        print(f"  {icon} {label}")
-        print(f"     {detail}")
-        if ok and not found_fema:
-            results["fema_nfhl"] = {"url": url, "label": label}
-            found_fema = True
+    return results
+
+
+def discover_fema(out, known):
+    """FEMA NFHL flood zones — candidate layers, then the NFHL layer directories."""
+    results = dict(known)
+    print("\n" + "=" * 50, file=out)
+    print("[3] FEMA NFHL FLOOD ZONES", file=out)
+    print("=" * 50, file=out)
+
+    # Fetch both FEMA layer directories while the candidates are probed
+    fema_dirs = [EXECUTOR.submit(_get_json, f"{base}?f=json") for base in FEMA_BASES]
+    run_probes(probes_for("fema_nfhl"), results, out)
 
     # Browse FEMA layers
-    for base in [
-        "https://hazards.fema.gov/arcgis/rest/services/public/NFHL/MapServer",
-        "https://hazards.fema.gov/gis/nfhl/rest/services/public/NFHL/MapServer",
-    ]:
-        print(f"\n  📂 Browsing {base}...")
+    for base, fema_dir in zip(FEMA_BASES, fema_dirs):
+        print(f"\n  📂 Browsing {base}...", file=out)
         try:
-            r = requests.get(f"{base}?f=json", timeout=TIMEOUT, verify=False)
-            meta = r.json()
+            meta = fema_dir.result()
             layers = meta.get("layers", [])
+            flood_layers = []
             for layer in layers:
                 name = layer.get("name", "")
                 if "fld_haz" in name.lower() or "flood" in name.lower():
-                    print(f"     🎯 Layer {layer['id']}: {name}")
-                    if not found_fema:
-                        test_url = f"{base}/{layer['id']}"
-                        ok2, detail2 = try_arcgis_service(test_url)
-                        if ok2:
-                            results["fema_nfhl"] = {"url": test_url}
-                            found_fema = True
-                            print(f"        ✅ WORKS: {test_url}")
+                    print(f"     🎯 Layer {layer['id']}: {name}", file=out)
+                    flood_layers.append(Probe("fema_nfhl", f"Layer {layer['id']}: {name}", f"{base}/{layer['id']}"))
+            if "fema_nfhl" not in results:
+                run_probes(flood_layers, results, out)
             if not layers:
-                print(f"     No layers found (got {list(meta.keys())})")
+                print(f"     No layers found (got {list(meta.keys())})", file=out)
         except Exception as e:
-            print(f"     Could not browse: {str(e)[:80]}")
-
-    # ===================================================================
-    # 4. EPA ENVIROFACTS
-    # ===================================================================
-    print("\n" + "=" * 50)
-    print("[4] EPA ENVIROFACTS (SEMS)")
-    print("=" * 50)
-
-    epa_candidates = [
-        ("New domain — data.epa.gov (lowercase)",
-         "https://data.epa.gov/efservice/sems.sems_active_sites/state_code/TX/rows/0:2/json"),
-        ("New domain — data.epa.gov (uppercase)",
-         "https://data.epa.gov/efservice/SEMS.SEMS_ACTIVE_SITES/STATE_CODE/TX/rows/0:2/JSON"),
-        ("New domain — data.epa.gov (no prefix)",
-         "https://data.epa.gov/efservice/SEMS_ACTIVE_SITES/STATE_CODE/TX/rows/0:2/JSON"),
-        ("Old domain — enviro.epa.gov",
-         "https://enviro.epa.gov/enviro/efservice/sems.sems_active_sites/state_code/TX/rows/0:2/json"),
-    ]
+            print(f"     Could not browse: {str(e)[:80]}", file=out)
 
-    found_epa = False
-    for label, url in epa_candidates:
-        ok, detail = try_rest_api(url)
-        icon = "✅" if ok else "❌"
-        print(f"  {icon} {label}")
-        print(f"     {detail}")
-        if ok and not found_epa:
-            # Extract base URL
-            base = url.split("/sems")[0].split("/SEMS")[0]
-            results["epa_envirofacts"] = {"url": url, "base": base, "label": label}
-            found_epa = True
-
-    # ===================================================================
-    # 5. EPA ECHO
-    # ===================================================================
-    print("\n" + "=" * 50)
-    print("[5] EPA ECHO")
-    print("=" * 50)
-
-    echo_candidates = [
-        ("ofmpub — echo13_rest_services",
-         "https://ofmpub.epa.gov/echo/echo13_rest_services.get_facilities?output=JSON&p_st=TX&p_lat=30.628&p_long=-96.334&p_radius=1"),
-        ("ofmpub — echo_rest_services",
-         "https://ofmpub.epa.gov/echo/echo_rest_services.get_facilities?output=JSON&p_st=TX&p_lat=30.628&p_long=-96.334&p_radius=1"),
-        ("echodata — echo_rest_services",
-         "https://echodata.epa.gov/echo/echo_rest_services.get_facilities?output=JSON&p_st=TX&p_lat=30.628&p_long=-96.334&p_radius=1"),
-        ("Old — echo.epa.gov",
-         "https://echo.epa.gov/api/echo_rest_services.get_facilities?output=JSON&p_st=TX&p_lat=30.628&p_long=-96.334&p_radius=1"),
-    ]
+    return results
 
-    found_echo = False
-    for label, url in echo_candidates:
-        ok, detail = try_rest_api(url)
-        icon = "✅" if ok else "❌"
-        print(f"  {icon} {label}")
-        print(f"     {detail}")
-        if ok and not found_echo:
-            results["epa_echo"] = {"url": url, "label": label}
-            found_echo = True
-
-    # ===================================================================
-    # 6. TCEQ — browse directory and try candidates
-    # ===================================================================
-    print("\n" + "=" * 50)
-    print("[6] TCEQ SERVICES")
-    print("=" * 50)
+
+def discover_epa_envirofacts(out, known):
+    """EPA Envirofacts SEMS — candidate domains and table spellings."""
+    results = dict(known)
+    print("\n" + "=" * 50, file=out)
+    print("[4] EPA ENVIROFACTS (SEMS)", file=out)
+    print("=" * 50, file=out)
+
+    if run_probes(probes_for("epa_envirofacts"), results, out):
+        # Extract base URL
+        found = results["epa_envirofacts"]
+        found.base = found.url.split("/sems")[0].split("/SEMS")[0]
+
+    return results
+
+
+def discover_epa_echo(out, known):
+    """EPA ECHO — candidate facility-search endpoints."""
+    results = dict(known)
+    print("\n" + "=" * 50, file=out)
+    print("[5] EPA ECHO", file=out)
+    print("=" * 50, file=out)
+
+    run_probes(probes_for("epa_echo"), results, out)
+
+    return results
+
+
+def discover_tceq(out, known):
+    """TCEQ — keyword search of the ArcGIS directory, direct candidates if it can't be read."""
+    results = dict(known)
+    print("\n" + "=" * 50, file=out)
+    print("[6] TCEQ SERVICES", file=out)
+    print("=" * 50, file=out)
 
     # Browse TCEQ directory
-    print("  📂 Browsing TCEQ ArcGIS directory...")
+    print("  📂 Browsing TCEQ ArcGIS directory...", file=out)
     ok, matches, all_names, folders = browse_arcgis_directory(
-        "https://services.arcgis.com/KTcxiTD9dsQw4r7Z/arcgis/rest/services/",
+        TCEQ_ROOT,
         ["lpst", "petroleum", "storage", "leaking", "hazardous", "waste", "municipal", "spill", "dryclean"]
     )
     if ok:
-        print(f"  Found {len(all_names)} total services")
+        print(f"  Found {len(all_names)} total services", file=out)
         if matches:
-            print(f"  🔍 Matches: {[(n, t) for n, t in matches]}")
-            for name, stype in matches:
-                url = f"https://services.arcgis.com/KTcxiTD9dsQw4r7Z/arcgis/rest/services/{name}/{stype}/0"
-                ok2, detail2 = try_arcgis_service(url)
-                icon = "✅" if ok2 else "❌"
-                print(f"  {icon} {name}: {detail2[:80]}")
-                if ok2:
-                    results[f"tceq_{name}"] = {"url": url}
+            print(f"  🔍 Matches: {[(n, t) for n, t in matches]}", file=out)
+            run_probes(_directory_probes("tceq_{name}", TCEQ_ROOT, matches), results, out)
         else:
-            print(f"  ⚠️  No keyword matches. Full service list:")
+            print(f"  ⚠️  No keyword matches. Full service list:", file=out)
             for n in sorted(all_names):
-                print(f"     - {n}")
+                print(f"     - {n}", file=out)
         if folders:
-            print(f"  📁 Folders to check: {folders}")
+            print(f"  📁 Folders to check: {folders}", file=out)
             for folder in folders:
-                print(f"\n  📂 Browsing folder: {folder}")
+                print(f"\n  📂 Browsing folder: {folder}", file=out)
                 ok3, matches3, names3, _ = browse_arcgis_directory(
-                    f"https://services.arcgis.com/KTcxiTD9dsQw4r7Z/arcgis/rest/services/{folder}/",
+                    f"{TCEQ_ROOT}{folder}/",
                     ["lpst", "petroleum", "storage", "leaking", "hazardous", "waste"]
                 )
                 if ok3:
                     for n in sorted(names3):
-                        print(f"     - {n}")
+                        print(f"     - {n}", file=out)
     else:
-        print("  ❌ Could not browse TCEQ directory")
+        print("  ❌ Could not browse TCEQ directory", file=out)
         # Try direct candidates
-        tceq_candidates = [
-            ("LPST_Points", "https://services.arcgis.com/KTcxiTD9dsQw4r7Z/arcgis/rest/services/LPST_Points/FeatureServer/0"),
-            ("LPST", "https://services.arcgis.com/KTcxiTD9dsQw4r7Z/arcgis/rest/services/LPST/FeatureServer/0"),
-            ("PetroleumStorageTanks", "https://services.arcgis.com/KTcxiTD9dsQw4r7Z/arcgis/rest/services/PetroleumStorageTanks/FeatureServer/0"),
-            ("PST", "https://services.arcgis.com/KTcxiTD9dsQw4r7Z/arcgis/rest/services/PST/FeatureServer/0"),
-        ]
-        for label, url in tceq_candidates:
-            ok, detail = try_arcgis_service(url)
-            icon = "✅" if ok else "❌"
-            print(f"  {icon} {label}: {detail[:80]}")
-            if ok:
-                results[f"tceq_{label}"] = {"url": url}
-
-    # ===================================================================
-    # 7. USFWS — wetlands and critical habitat
-    # ===================================================================
-    print("\n" + "=" * 50)
-    print("[7] USFWS SERVICES")
-    print("=" * 50)
+        run_probes(probes_for("tceq_"), results, out)
+
+    return results
+
+
+def discover_usfws(out, known):
+    """USFWS — NWI wetlands, then critical habitat via directory search and fallbacks."""
+    results = dict(known)
+    print("\n" + "=" * 50, file=out)
+    print("[7] USFWS SERVICES", file=out)
+    print("=" * 50, file=out)
 
     # Wetlands
-    print("\n  --- NWI Wetlands ---")
-    wetland_candidates = [
-        ("USGS/FWS MapServer layer 0",
-         "https://fwspublicservices.wim.usgs.gov/wetlandsmapservice/rest/services/Wetlands/MapServer/0"),
-        ("USGS/FWS WMS (backup)",
-         "https://www.fws.gov/wetlands/data/mapper.html"),
-    ]
-    found_wetlands = False
-    for label, url in wetland_candidates:
-        if "mapper.html" in url:
-            continue  # skip non-API URLs
-        ok, detail = try_arcgis_service(url)
-        icon = "✅" if ok else "❌"
-        print(f"  {icon} {label}")
-        print(f"     {detail}")
-        if ok:
-            results["usfws_nwi"] = {"url": url}
-            found_wetlands = True
-
-    if not found_wetlands:
-        print("  ℹ️  Wetlands endpoint may just be slow. Try increasing timeout.")
+    print("\n  --- NWI Wetlands ---", file=out)
+    run_probes(probes_for("usfws_nwi"), results, out)
+    if "usfws_nwi" not in results:
+        print("  ℹ️  Wetlands endpoint may just be slow. Try increasing timeout.", file=out)
 
     # Critical Habitat
-    print("\n  --- Critical Habitat ---")
+    print("\n  --- Critical Habitat ---", file=out)
 
     # Browse USFWS directory
-    print("  📂 Browsing USFWS ArcGIS directory...")
+    print("  📂 Browsing USFWS ArcGIS directory...", file=out)
     ok, matches, all_names, folders = browse_arcgis_directory(
-        "https://services.arcgis.com/QVENGdaPbd4LUkLV/arcgis/rest/services/",
+        USFWS_ROOT,
         ["critical_habitat", "habitat", "endangered", "threatened", "species"]
     )
     if ok:
-        print(f"  Found {len(all_names)} total services")
+        print(f"  Found {len(all_names)} total services", file=out)
         if matches:
-            print(f"  🔍 Matches:")
-            for name, stype in matches:
-                url = f"https://services.arcgis.com/QVENGdaPbd4LUkLV/arcgis/rest/services/{name}/{stype}/0"
-                ok2, detail2 = try_arcgis_service(url)
-                icon = "✅" if ok2 else "❌"
-                print(f"  {icon} {name}: {detail2[:80]}")
-                if ok2:
-                    results["usfws_critical_habitat"] = {"url": url}
+            print(f"  🔍 Matches:", file=out)
+            run_probes(_directory_probes("usfws_critical_habitat", USFWS_ROOT, matches), results, out)
         else:
-            print(f"  ⚠️  No matches. Services with 'habitat' or 'species':")
+            print(f"  ⚠️  No matches. Services with 'habitat' or 'species':", file=out)
             for n in sorted(all_names):
                 if any(t in n.lower() for t in ["habitat", "species", "critical", "fws", "endangered"]):
-                    print(f"     🎯 {n}")
-            print(f"\n  Full list ({len(all_names)} services):")
+                    print(f"     🎯 {n}", file=out)
+            print(f"\n  Full list ({len(all_names)} services):", file=out)
             for n in sorted(all_names)[:50]:
-                print(f"     - {n}")
+                print(f"     - {n}", file=out)
             if len(all_names) > 50:
-                print(f"     ... and {len(all_names) - 50} more")
+                print(f"     ... and {len(all_names) - 50} more", file=out)
     else:
-        print("  ❌ Could not browse USFWS directory")
+        print("  ❌ Could not browse USFWS directory", file=out)
 
     # Try alternative USFWS critical habitat URLs
-    ch_candidates = [
-        ("ECOS Critical Habitat",
-         "https://services.arcgis.com/QVENGdaPbd4LUkLV/arcgis/rest/services/FWS_HQ_ES_Critical_Habitat/FeatureServer/0"),
-        ("ECOS CH (v2)",
-         "https://services.arcgis.com/QVENGdaPbd4LUkLV/arcgis/rest/services/Critical_Habitat/FeatureServer/0"),
-        ("FWS ECOS GIS",
-         "https://services.arcgis.com/QVENGdaPbd4LUkLV/arcgis/rest/services/USFWS_Critical_Habitat/FeatureServer/0"),
-    ]
-    found_ch = "usfws_critical_habitat" in results
-    for label, url in ch_candidates:
-        if found_ch:
-            break
-        ok, detail = try_arcgis_service(url)
-        icon = "✅" if ok else "❌"
-        print(f"  {icon} {label}: {detail[:80]}")
-        if ok:
-            results["usfws_critical_habitat"] = {"url": url}
-            found_ch = True
-
-    # ===================================================================
-    # SUMMARY
-    # ===================================================================
-    print("\n" + "=" * 70)
-    print("DISCOVERY SUMMARY")
-    print("=" * 70)
+    if "usfws_critical_habitat" not in results:
+        ch_probes, unlisted = drop_unlisted_services(probes_for("usfws_critical_habitat"), USFWS_ROOT)
+        for p in unlisted:
+            print(f"  ⏭️  {p.label} — not in directory, skipped", file=out)
+        run_probes(ch_probes, results, out)
+
+    return results
+
+
+SECTIONS = {
+    "substations": discover_substations,
+    "transmission": discover_transmission,
+    "fema": discover_fema,
+    "epa": discover_epa_envirofacts,
+    "echo": discover_epa_echo,
+    "tceq": discover_tceq,
+    "usfws": discover_usfws,
+}
+
+
+def load_existing(path):
+    """Results from a previous run's output file, keyed by service."""
+    with open(path) as f:
+        saved = json.load(f).get("results", {})
+    return {key: EndpointResult(**entry) for key, entry in saved.items()}
+
+
+def load_extra_candidates(path):
+    """
+    Extra probes from a text file, one "service_key url" per line ("#" starts
+    a comment). URLs with a FeatureServer/MapServer segment are probed as
+    ArcGIS layers, anything else as plain REST. Lines whose service_key no
+    section probes are skipped with a warning; keys that are only probed as
+    a fallback are kept, with a note saying so.
+    """
+    probes = []
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            service_key, url = line.split(None, 1)
+            if not service_key.startswith(PROBED_PREFIXES):
+                print(
+                    f"⚠️  {path}:{lineno}: no section probes service_key "
+                    f"'{service_key}' — skipped (expected one of: {', '.join(PROBED_PREFIXES)})",
+                    file=sys.stderr,
+                )
+                continue
+            if service_key.startswith(FALLBACK_ONLY_PREFIXES):
+                print(
+                    f"ℹ️  {path}:{lineno}: '{service_key}' is only probed if its "
+                    f"section's directory search finds nothing",
+                    file=sys.stderr,
+                )
+            kind = "arcgis" if re.search(r"/(Feature|Map)Server/", url) else "rest"
+            probes.append(Probe(service_key, f"Extra — {url}", url, kind=kind))
+    return probes
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Find working endpoints for every BESS Site Scout data source.")
+    parser.add_argument(
+        "--only", action="append", choices=list(SECTIONS),
+        help="Run just this section (repeatable). Default: all sections",
+    )
+    parser.add_argument(
+        "--candidates", metavar="PATH",
+        help='Extra candidate URLs, one "service_key url" per line; tried after the built-in ones',
+    )
+    parser.add_argument(
+        "--existing", metavar="PATH",
+        help="Previous discovery output; services already found there are kept and not re-probed",
+    )
+    return parser.parse_args(argv)
+
+
+def _run_section(section, known):
+    """Run one section with its report captured. Returns (output, results)."""
+    out = io.StringIO()
+    results = section(out, known)
+    return out.getvalue(), results
+
+
+def write_summary(results, out):
+    """The closing report: which services were found, and where."""
+    print("\n" + "=" * 70, file=out)
+    print("DISCOVERY SUMMARY", file=out)
+    print("=" * 70, file=out)
 
     services_needed = [
         "substations", "transmission_lines", "fema_nfhl",
@@ -437,31 +680,65 @@ def main():
 
     for svc in services_needed:
         if svc in results:
-            print(f"  ✅ {svc}: {results[svc]['url']}")
+            print(f"  ✅ {svc}: {results[svc].url}", file=out)
         else:
-            print(f"  ❌ {svc}: NOT FOUND")
+            print(f"  ❌ {svc}: NOT FOUND", file=out)
 
     if tceq_keys:
         for k in tceq_keys:
-            print(f"  ✅ {k}: {results[k]['url']}")
+            print(f"  ✅ {k}: {results[k].url}", file=out)
     else:
-        print(f"  ❌ TCEQ services: NOT FOUND")
+        print(f"  ❌ TCEQ services: NOT FOUND", file=out)
 
     if usfws_keys:
         for k in usfws_keys:
-            print(f"  ✅ {k}: {results[k]['url']}")
+            print(f"  ✅ {k}: {results[k].url}", file=out)
     else:
-        print(f"  ❌ USFWS services: NOT FOUND")
+        print(f"  ❌ USFWS services: NOT FOUND", file=out)
 
     total_found = len(results)
-    print(f"\n  {total_found} endpoints discovered")
-    print("=" * 70)
-
-    # Save results
-    with open("discovered_endpoints.json", "w") as f:
-        json.dump({"timestamp": datetime.now().isoformat(), "results": results}, f, indent=2)
-    print(f"\nResults saved to discovered_endpoints.json")
-    print("Share the output above so we can update the codebase!")
+    print(f"\n  {total_found} endpoints discovered", file=out)
+    print("=" * 70, file=out)
+
+    # Results were checkpointed as each section finished
+    print(f"\nResults saved to {OUTPUT_FILE}", file=out)
+    print("Share the output above so we can update the codebase!", file=out)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sections = [SECTIONS[name] for name in dict.fromkeys(args.only)] if args.only else list(SECTIONS.values())
+    if args.candidates:
+        PROBES.extend(load_extra_candidates(args.candidates))
+    known = load_existing(args.existing) if args.existing else {}
+
+    started = datetime.now().isoformat()
+    header = ["=" * 70, "BESS Site Scout — Endpoint Discovery", f"Timestamp: {started}", "=" * 70]
+    warm_hosts(sorted({f"https://{urlparse(p.url).netloc}/" for p in PROBES}))
+    if DEAD_HOSTS:
+        header.append(f"Unreachable hosts (skipped): {', '.join(sorted(DEAD_HOSTS))}")
+    if known:
+        header.append(f"Already known from {args.existing}: {', '.join(known)}")
+    sys.stdout.write("\n".join(header) + "\n")
+    sys.stdout.flush()
+
+    # The sections target different hosts, so they all run at once. Each one
+    # writes its report to its own buffer; reports are written, and results
+    # checkpointed, in section order as they finish.
+    results = dict(known)
+    with ThreadPoolExecutor(max_workers=len(sections)) as section_pool:
+        futures = [section_pool.submit(_run_section, section, known) for section in sections]
+        for future in futures:
+            output, section_results = future.result()
+            # One write per section; flushed so progress shows even when piped
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            results.update(section_results)
+            save_results(results, started)
+
+    summary = io.StringIO()
+    write_summary(results, summary)
+    sys.stdout.write(summary.getvalue())
 
     return 0
 
@@ -15,16 +15,36 @@ reserves. These markets provide additional revenue stacking on top
 of energy arbitrage and capacity payments.
 """
 
+import copy
 import logging
 import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, List, Dict
 from pathlib import Path
 
 import pandas as pd
 import numpy as np
 
-from ..utils.api_client import APIClient
+from ..utils.api_client import APIClient, get_client
+from ..utils.cache import (
+    CACHE_SUFFIX,
+    atomic_write_df,
+    cache_age,
+    existing_cache,
+    read_cached_df,
+)
+from ..utils.frames import CSV_ENGINE, concat_days
+from ..utils.oasis import read_zipped_csv
+
+try:
+    from numba import njit  # optional — compiles the AS revenue kernel
+except ImportError:
+    njit = None
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +54,72 @@ PJM_DATAMINER_BASE = "https://dataminer2.pjm.com/feed"
 MISO_MARKET_BASE = "https://docs.misoenergy.org/marketreports"
 ERCOT_DATA_BASE = "https://www.ercot.com/content/cdr/html"
 
+# Per-day report downloads from every ISO share one bounded pool, so
+# fetching several ISOs at once does not multiply the thread count.
+MAX_REPORT_WORKERS = 16
+_REPORT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_REPORT_WORKERS, thread_name_prefix="as-report"
+)
+
+# Fixed category list so per-ISO frames concat without falling back to object
+ISO_DTYPE = pd.CategoricalDtype(["CAISO", "PJM", "ERCOT", "MISO", "NYISO", "SPP"])
+
+# Rolling-window caches, and daily reports cached before their day was
+# over (possibly partial), are refreshed once older than this. A report
+# cached after the end of its day is final and never expires.
+_CACHE_TTL_SECONDS = 24 * 3600
+
+
+def _day_end(day: datetime) -> float:
+    """Timestamp of the midnight that closes ``day``."""
+    start = day.replace(hour=0, minute=0, second=0, microsecond=0)
+    return (start + timedelta(days=1)).timestamp()
+
+
+def _tag_iso(df: pd.DataFrame, iso: str) -> pd.DataFrame:
+    """
+    Add the categorical ``iso`` column.
+
+    A shared category list keeps ``iso`` categorical through the
+    cross-ISO concat.
+    """
+    df["iso"] = pd.Categorical([iso] * len(df), dtype=ISO_DTYPE)
+    return df
+
+
+def _parse_csv(source) -> pd.DataFrame:
+    """Parse a downloaded report with the fastest available CSV engine."""
+    return pd.read_csv(source, engine=CSV_ENGINE)
+
+
+def _validators_path(cache_file: Path) -> Path:
+    return cache_file.with_suffix(".meta.json")
+
+
+def _write_validators(cache_file: Path, response_headers) -> None:
+    """Store a response's ETag / Last-Modified next to its cache file."""
+    validators = {
+        key: response_headers[key]
+        for key in ("ETag", "Last-Modified")
+        if key in response_headers
+    }
+    if validators:
+        _validators_path(cache_file).write_text(json.dumps(validators))
+
+
+def _conditional_headers(cache_file: Path) -> Dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers for a cached report."""
+    try:
+        validators = json.loads(_validators_path(cache_file).read_text())
+    except (OSError, ValueError):
+        return {}
+    headers = {}
+    if "ETag" in validators:
+        headers["If-None-Match"] = validators["ETag"]
+    if "Last-Modified" in validators:
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+    return headers
+
 # ── AS product definitions ────────────────────────────────────────
 AS_PRODUCTS = {
     "reg_up": {
@@ -107,22 +193,116 @@ AS_REFERENCE_PRICES = {
 }
 
 
+# ── Flattened reference table ─────────────────────────────────────
+# AS_REFERENCE_PRICES as one (iso, product)-indexed frame, built once at
+# import so lookups are index slices rather than nested dict walks.
+AS_PRICE_TABLE = pd.DataFrame(
+    [
+        {
+            "iso": iso,
+            "product": product,
+            "avg_price": values.get("avg_price", 0),
+            "peak_price": values.get("peak_price", np.nan),
+            "units": values.get("units", ""),
+        }
+        for iso, products in AS_REFERENCE_PRICES.items()
+        for product, values in products.items()
+        if isinstance(values, dict)
+    ]
+).set_index(["iso", "product"])
+
+# Products that earn AS revenue in the estimate, and whether each one is
+# committed for the regulation share of the year or the reserve share.
+_REVENUE_PRODUCTS = ("reg_up", "reg_down", "spin", "rrs")
+_IS_REGULATION = np.array([True, True, False, False])
+
+# One row of average prices per ISO (NaN where the ISO lacks a product),
+# so an estimate is a single broadcast multiply.
+_AS_ISO_ROWS = {iso: i for i, iso in enumerate(AS_REFERENCE_PRICES)}
+_AS_AVG_PRICES = (
+    AS_PRICE_TABLE["avg_price"]
+    .unstack()
+    .reindex(index=list(AS_REFERENCE_PRICES), columns=list(_REVENUE_PRODUCTS))
+    .to_numpy(dtype=float)
+)
+
+
+def _as_revenue_kernel(
+    avg_prices: np.ndarray, capacity_mw: float, hours: np.ndarray
+) -> np.ndarray:
+    """Annual revenue per product: average price x MW x committed hours."""
+    return avg_prices * capacity_mw * hours
+
+
+if njit is not None:
+    _as_revenue_kernel = njit(cache=True)(_as_revenue_kernel)
+    # Compile at import so the first estimate does not pay for it
+    _as_revenue_kernel(_AS_AVG_PRICES[0], 1.0, np.ones(len(_REVENUE_PRODUCTS)))
+
+
+@lru_cache(maxsize=128)
+def _estimate_as_revenue(
+    iso_upper: str,
+    capacity_mw: float,
+    hours_per_year: int,
+    reg_pct: float,
+    spin_pct: float,
+) -> Dict:
+    """
+    AS revenue estimate for one ISO, memoized.
+
+    Reads only AS_REFERENCE_PRICES, so the result depends on the
+    arguments alone. Arguments are positional to keep cache keys stable.
+    """
+    row = _AS_ISO_ROWS.get(iso_upper)
+    if row is None:
+        return {"iso": iso_upper, "total_annual_revenue": 0}
+
+    avg_prices = _AS_AVG_PRICES[row]
+    hours = np.where(
+        _IS_REGULATION, hours_per_year * reg_pct, hours_per_year * spin_pct
+    )
+    annual = _as_revenue_kernel(avg_prices, float(capacity_mw), hours)
+
+    revenues = {}
+    rows = zip(_REVENUE_PRODUCTS, avg_prices, hours, annual)
+    for product, avg_price, hrs, rev in rows:
+        if np.isnan(avg_price):
+            continue
+        revenues[product] = {
+            "avg_price_mw": float(avg_price),
+            "hours_committed": round(float(hrs)),
+            "annual_revenue": round(float(rev)),
+        }
+
+    total = sum(r.get("annual_revenue", 0) for r in revenues.values())
+
+    return {
+        "iso": iso_upper,
+        "capacity_mw": capacity_mw,
+        "products": revenues,
+        "total_annual_revenue": round(total),
+        "revenue_per_mw": round(total / capacity_mw) if capacity_mw else 0,
+    }
+
+
 class AncillaryServicesIngestor:
     """
     Ingests ancillary services market data from US ISOs.
 
     Provides:
       - get_as_prices(): Reference ancillary services prices
+      - get_as_price_table(): Reference prices as a flat (iso, product) table
       - get_as_by_iso(): ISO-specific AS market data
       - get_all_as(): Combined AS data across ISOs
       - estimate_as_revenue(): Estimate annual AS revenue for BESS
       - get_as_summary(): Summary for pipeline scoring
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, client: Optional[APIClient] = None):
         self.config = config
         self.api_keys = config.get("api_keys", {})
-        self.client = APIClient(
+        self.client = client or get_client(
             cache_dir=config.get("cache", {}).get("directory", "./data/cache"),
             cache_enabled=config.get("cache", {}).get("enabled", True),
         )
@@ -131,6 +311,7 @@ class AncillaryServicesIngestor:
         )
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self._as_data = {}
+        self._as_data_lock = threading.Lock()
 
     # ── CAISO AS Prices ───────────────────────────────────────────
 
@@ -150,26 +331,21 @@ class AncillaryServicesIngestor:
                 "anc_type": "ALL",
             }
 
-            cache_file = self.cache_dir / f"caiso_as_{days_back}d.csv"
-            import time
-            if cache_file.exists():
-                age = (time.time() - cache_file.stat().st_mtime) / 3600
-                if age < 24:
-                    return pd.read_csv(cache_file)
+            cache_file = self.cache_dir / f"caiso_as_{days_back}d{CACHE_SUFFIX}"
+            cached = existing_cache(cache_file)
+            if cached is not None and cache_age(cached) < _CACHE_TTL_SECONDS:
+                return _tag_iso(read_cached_df(cached), "CAISO")
 
-            import zipfile
             logger.info("  CAISO: fetching ancillary services prices...")
             response = self.client.session.get(
-                CAISO_OASIS_BASE, params=params, timeout=120
+                CAISO_OASIS_BASE, params=params, timeout=120, stream=True
             )
             response.raise_for_status()
 
-            z = zipfile.ZipFile(io.BytesIO(response.content))
-            with z.open(z.namelist()[0]) as f:
-                df = pd.read_csv(f)
+            df = read_zipped_csv(response, engine=CSV_ENGINE)
 
-            df.to_csv(cache_file, index=False)
-            df["iso"] = "CAISO"
+            atomic_write_df(cache_file, df)
+            df = _tag_iso(df, "CAISO")
             logger.info(f"  CAISO AS: {len(df)} records")
             return df
 
@@ -207,7 +383,7 @@ class AncillaryServicesIngestor:
             records = data if isinstance(data, list) else data.get("items", [])
             if records:
                 df = pd.DataFrame(records)
-                df["iso"] = "PJM"
+                df = _tag_iso(df, "PJM")
                 logger.info(f"  PJM AS: {len(df)} regulation/reserve records")
                 return df
 
@@ -221,38 +397,24 @@ class AncillaryServicesIngestor:
     def _get_ercot_as(self, days_back: int = 7) -> pd.DataFrame:
         """Fetch ERCOT ancillary services data from public reports."""
         try:
-            frames = []
             end_date = datetime.now()
-
+            days = []
             for i in range(min(days_back, 7)):
-                dt = end_date - timedelta(days=i)
-                date_str = dt.strftime("%Y%m%d")
-
+                day = end_date - timedelta(days=i)
+                date_str = day.strftime("%Y%m%d")
                 # ERCOT posts DAM AS clearing prices
-                url = f"{ERCOT_DATA_BASE}/{date_str}_dam_as.csv"
-
-                cache_file = self.cache_dir / f"ercot_as_{date_str}.csv"
-                if cache_file.exists():
-                    try:
-                        frames.append(pd.read_csv(cache_file))
-                        continue
-                    except Exception:
-                        pass
-
-                try:
-                    response = self.client.session.get(url, timeout=30)
-                    if response.status_code == 200:
-                        df = pd.read_csv(io.StringIO(response.text))
-                        df.to_csv(cache_file, index=False)
-                        frames.append(df)
-                except Exception:
-                    continue
+                days.append((
+                    f"{ERCOT_DATA_BASE}/{date_str}_dam_as.csv",
+                    self.cache_dir / f"ercot_as_{date_str}{CACHE_SUFFIX}",
+                    _day_end(day),
+                ))
 
+            frames = self._fetch_daily_reports(days)
             if not frames:
                 return pd.DataFrame()
 
-            df = pd.concat(frames, ignore_index=True)
-            df["iso"] = "ERCOT"
+            df = concat_days(frames)
+            df = _tag_iso(df, "ERCOT")
             logger.info(f"  ERCOT AS: {len(df)} records")
             return df
 
@@ -265,37 +427,23 @@ class AncillaryServicesIngestor:
     def _get_miso_as(self, days_back: int = 7) -> pd.DataFrame:
         """Fetch MISO ancillary services reports."""
         try:
-            frames = []
             end_date = datetime.now()
-
+            days = []
             for i in range(min(days_back, 7)):
-                dt = end_date - timedelta(days=i)
-                date_str = dt.strftime("%Y%m%d")
-
-                url = f"{MISO_MARKET_BASE}/{date_str}_asm_expost_damcp.csv"
-
-                cache_file = self.cache_dir / f"miso_as_{date_str}.csv"
-                if cache_file.exists():
-                    try:
-                        frames.append(pd.read_csv(cache_file))
-                        continue
-                    except Exception:
-                        pass
-
-                try:
-                    response = self.client.session.get(url, timeout=30)
-                    if response.status_code == 200:
-                        df = pd.read_csv(io.StringIO(response.text))
-                        df.to_csv(cache_file, index=False)
-                        frames.append(df)
-                except Exception:
-                    continue
-
+                day = end_date - timedelta(days=i)
+                date_str = day.strftime("%Y%m%d")
+                days.append((
+                    f"{MISO_MARKET_BASE}/{date_str}_asm_expost_damcp.csv",
+                    self.cache_dir / f"miso_as_{date_str}{CACHE_SUFFIX}",
+                    _day_end(day),
+                ))
+
+            frames = self._fetch_daily_reports(days)
             if not frames:
                 return pd.DataFrame()
 
-            df = pd.concat(frames, ignore_index=True)
-            df["iso"] = "MISO"
+            df = concat_days(frames)
+            df = _tag_iso(df, "MISO")
             logger.info(f"  MISO AS: {len(df)} records")
             return df
 
@@ -303,12 +451,83 @@ class AncillaryServicesIngestor:
             logger.warning(f"  MISO AS fetch failed: {e}")
             return pd.DataFrame()
 
+    # ── Daily report fan-out ──────────────────────────────────────
+
+    def _fetch_daily_report(
+        self, url: str, cache_file: Path, day_end: float
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load one day's report from cache, or download and cache it.
+
+        A report cached after ``day_end`` (the timestamp closing the day
+        it covers) is final and used as-is. One cached earlier may be
+        partial, so it is only reused while younger than
+        _CACHE_TTL_SECONDS; after that it is checked against the server
+        with a conditional GET and reused on 304 Not Modified.
+        """
+        cached = existing_cache(cache_file)
+        headers = {}
+        if cached is not None:
+            final = cached.stat().st_mtime >= day_end
+            if final or cache_age(cached) < _CACHE_TTL_SECONDS:
+                try:
+                    return read_cached_df(cached)
+                except Exception:
+                    cached = None
+            else:
+                headers = _conditional_headers(cache_file)
+
+        try:
+            response = self.client.get_response(url, headers=headers, timeout=30)
+            if response.status_code == 304 and cached is not None:
+                try:
+                    df = read_cached_df(cached)
+                    os.utime(cached)  # still current; restart its TTL
+                    return df
+                except Exception:
+                    # Unreadable cache — fetch the full report again
+                    response = self.client.get_response(url, timeout=30)
+            if response.status_code == 200:
+                df = _parse_csv(io.BytesIO(response.content))
+                atomic_write_df(cache_file, df)
+                _write_validators(cache_file, response.headers)
+                return df
+        except Exception:
+            pass
+        return None
+
+    def _fetch_daily_reports(self, days: List[tuple]) -> List[pd.DataFrame]:
+        """
+        Fetch (url, cache_file, day_end) entries concurrently.
+
+        The per-day reports are independent, so all of them are submitted
+        at once to the shared report pool; frames come back in the order
+        of ``days``.
+        """
+        futs = [_REPORT_EXECUTOR.submit(self._fetch_daily_report, *day) for day in days]
+        results = (fut.result() for fut in futs)
+        return [df for df in results if df is not None]
+
     # ── Public interface ──────────────────────────────────────────
 
     def get_as_prices(self) -> Dict:
         """Return reference ancillary services prices by ISO."""
         return AS_REFERENCE_PRICES
 
+    def get_as_price_table(self, iso: Optional[str] = None) -> pd.DataFrame:
+        """
+        Return reference AS prices as a flat table indexed by (iso, product).
+
+        With ``iso``, returns that ISO's rows indexed by product; unknown
+        ISOs give an empty frame.
+        """
+        if iso is None:
+            return AS_PRICE_TABLE
+        iso_upper = iso.upper()
+        if iso_upper not in _AS_ISO_ROWS:
+            return AS_PRICE_TABLE.iloc[0:0].droplevel("iso")
+        return AS_PRICE_TABLE.xs(iso_upper, level="iso")
+
     def get_as_by_iso(self, iso_name: str, days_back: int = 7) -> pd.DataFrame:
         """Fetch AS market data for a single ISO."""
         iso_upper = iso_name.upper()
@@ -328,7 +547,8 @@ class AncillaryServicesIngestor:
 
         df = method()
         if not df.empty:
-            self._as_data[iso_upper] = df
+            with self._as_data_lock:
+                self._as_data[iso_upper] = df
         return df
 
     def get_all_as(
@@ -340,12 +560,24 @@ class AncillaryServicesIngestor:
         if isos is None:
             isos = ["CAISO", "PJM", "ERCOT", "MISO"]
 
-        frames = []
-        for iso in isos:
-            df = self.get_as_by_iso(iso, days_back=days_back)
-            if not df.empty:
-                frames.append(df)
+        if not isos:
+            return pd.DataFrame()
+
+        # Each ISO is an independent set of blocking HTTP calls, so fetch
+        # them side by side; wall time is then the slowest ISO, not the sum.
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(isos)) as ex:
+            futs = {
+                ex.submit(self.get_as_by_iso, iso, days_back): iso
+                for iso in isos
+            }
+            for fut in as_completed(futs):
+                df = fut.result()
+                if not df.empty:
+                    results[futs[fut]] = df
 
+        # Keep the combined frame in the requested ISO order
+        frames = [results[iso] for iso in isos if iso in results]
         return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
     def estimate_as_revenue(
@@ -369,47 +601,10 @@ class AncillaryServicesIngestor:
         Returns:
             Dict with revenue estimates by AS product.
         """
-        iso_upper = iso.upper()
-        ref = AS_REFERENCE_PRICES.get(iso_upper, {})
-
-        if not ref:
-            return {"iso": iso_upper, "total_annual_revenue": 0}
-
-        revenues = {}
-
-        # Regulation revenue
-        for product in ["reg_up", "reg_down"]:
-            if product in ref:
-                avg_price = ref[product].get("avg_price", 0)
-                hours = hours_per_year * reg_pct
-                rev = avg_price * capacity_mw * hours
-                revenues[product] = {
-                    "avg_price_mw": avg_price,
-                    "hours_committed": round(hours),
-                    "annual_revenue": round(rev),
-                }
-
-        # Spinning reserve
-        for product in ["spin", "rrs"]:
-            if product in ref:
-                avg_price = ref[product].get("avg_price", 0)
-                hours = hours_per_year * spin_pct
-                rev = avg_price * capacity_mw * hours
-                revenues[product] = {
-                    "avg_price_mw": avg_price,
-                    "hours_committed": round(hours),
-                    "annual_revenue": round(rev),
-                }
-
-        total = sum(r.get("annual_revenue", 0) for r in revenues.values())
-
-        return {
-            "iso": iso_upper,
-            "capacity_mw": capacity_mw,
-            "products": revenues,
-            "total_annual_revenue": round(total),
-            "revenue_per_mw": round(total / capacity_mw) if capacity_mw else 0,
-        }
+        # Deep copy — the nested "products" dicts belong to the cache
+        return copy.deepcopy(_estimate_as_revenue(
+            iso.upper(), capacity_mw, hours_per_year, reg_pct, spin_pct
+        ))
 
     def get_as_summary(self) -> Dict:
         """Generate ancillary services summary for pipeline output."""
@@ -425,14 +620,11 @@ class AncillaryServicesIngestor:
             summary["revenue_estimates"][iso] = rev
 
         # Rank by revenue
-        ranked = sorted(
-            summary["revenue_estimates"].items(),
-            key=lambda x: x[1].get("total_annual_revenue", 0),
-            reverse=True,
+        ranked = (
+            pd.DataFrame(list(summary["revenue_estimates"].values()))
+            .sort_values("total_annual_revenue", ascending=False, kind="stable")
+            .rename(columns={"total_annual_revenue": "annual_$/100MW"})
         )
-        summary["best_as_markets"] = [
-            {"iso": iso, "annual_$/100MW": data.get("total_annual_revenue", 0)}
-            for iso, data in ranked
-        ]
+        summary["best_as_markets"] = ranked[["iso", "annual_$/100MW"]].to_dict("records")
 
         return summary
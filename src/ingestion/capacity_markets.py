@@ -17,13 +17,14 @@ most established.
 import logging
 import io
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from functools import lru_cache
+from typing import Callable, Optional, List, Dict
 from pathlib import Path
 
 import pandas as pd
 import numpy as np
 
-from ..utils.api_client import APIClient
+from ..utils.api_client import APIClient, get_client
 
 logger = logging.getLogger(__name__)
 
@@ -137,6 +138,135 @@ CAPACITY_PRICES_REFERENCE = {
     },
 }
 
+# PJM reference clearing prices flattened to one row per delivery year and
+# zone, built once at import for the no-key / fallback paths. Those paths
+# hand out shallow copies, so the default (no API key) costs no rebuild.
+PJM_RPM_REFERENCE = pd.DataFrame(
+    [
+        {
+            "delivery_year": dy,
+            "zone": zone,
+            "clearing_price_mw_day": price,
+            "iso": "PJM",
+        }
+        for dy, zones in CAPACITY_PRICES_REFERENCE["PJM"]["delivery_years"].items()
+        for zone, price in zones.items()
+        if zone not in ("units", "note")
+    ]
+).astype({
+    "delivery_year": "category",
+    "clearing_price_mw_day": "float64",
+    "iso": "category",
+})
+
+
+# ── Per-ISO revenue calculators ──────────────────────────────────
+# Each takes the ISO's reference entry and an optional zone and returns
+# the ISO-specific fields of the revenue estimate.
+
+def _pjm_revenue(ref: dict, zone: Optional[str]) -> Dict:
+    # Use most recent delivery year
+    latest = list(ref.get("delivery_years", {}).values())
+    if not latest:
+        return {}
+    dy = latest[-1]
+    price = dy.get("RTO_avg", 0)
+    if zone and zone in dy:
+        price = dy[zone]
+    return {
+        "capacity_price_mw_day": price,
+        "annual_revenue_per_mw": round(price * 365, 0),
+        "units": "$/MW-day",
+    }
+
+
+def _nyiso_revenue(ref: dict, zone: Optional[str]) -> Dict:
+    zd = ref.get("zones", {}).get(zone or "Rest_of_State", {})
+    summer = zd.get("summer_2025", 0)
+    winter = zd.get("winter_2025", 0)
+    # Average monthly * 12 months * 1000 (kW to MW)
+    avg_monthly = (summer + winter) / 2
+    return {
+        "capacity_price_kw_month": avg_monthly,
+        "annual_revenue_per_mw": round(avg_monthly * 12 * 1000, 0),
+        "units": "$/kW-month",
+    }
+
+
+def _isone_revenue(ref: dict, zone: Optional[str]) -> Dict:
+    auctions = ref.get("auctions", {})
+    latest = list(auctions.values())[-1] if auctions else {}
+    price = latest.get("clearing_price", 0)
+    return {
+        "capacity_price_kw_month": price,
+        "annual_revenue_per_mw": round(price * 12 * 1000, 0),
+        "units": "$/kW-month",
+    }
+
+
+def _miso_revenue(ref: dict, zone: Optional[str]) -> Dict:
+    zd = ref.get("zones", {}).get(zone or "Zone_1", {})
+    price = zd.get("2025", 0)
+    return {
+        "capacity_price_mw_day": price,
+        "annual_revenue_per_mw": round(price * 365, 0),
+        "units": "$/MW-day",
+    }
+
+
+def _ercot_revenue(ref: dict, zone: Optional[str]) -> Dict:
+    return {
+        "mechanism": "ORDC",
+        "note": ref.get("note", ""),
+        "avg_ordc_adder": ref.get("avg_ordc_adder_2024", 0),
+    }
+
+
+def _caiso_revenue(ref: dict, zone: Optional[str]) -> Dict:
+    price = ref.get("estimated_ra_value_2025", {}).get("system_avg", 0)
+    return {
+        "capacity_price_kw_month": price,
+        "annual_revenue_per_mw": round(price * 12 * 1000, 0),
+        "mechanism": "bilateral RA",
+        "units": "$/kW-month",
+    }
+
+
+_REVENUE_CALCULATORS: Dict[str, Callable[[dict, Optional[str]], Dict]] = {
+    "PJM": _pjm_revenue,
+    "NYISO": _nyiso_revenue,
+    "ISONE": _isone_revenue,
+    "MISO": _miso_revenue,
+    "ERCOT": _ercot_revenue,
+    "CAISO": _caiso_revenue,
+}
+
+
+@lru_cache(maxsize=128)
+def _annual_capacity_revenue(iso_upper: str, zone: Optional[str]) -> Dict:
+    """
+    Capacity revenue estimate for one ISO/zone, memoized.
+
+    Reads only CAPACITY_PRICES_REFERENCE, so the result depends on the
+    arguments alone. Callers get a shallow copy via
+    CapacityMarketIngestor.get_annual_capacity_revenue.
+    """
+    ref = CAPACITY_PRICES_REFERENCE.get(iso_upper, {})
+
+    if not ref:
+        return {"iso": iso_upper, "has_capacity_market": False}
+
+    result = {
+        "iso": iso_upper,
+        "auction_type": ref.get("auction_type", "Unknown"),
+        "has_capacity_market": iso_upper in ("PJM", "NYISO", "ISONE", "MISO"),
+    }
+
+    calc = _REVENUE_CALCULATORS.get(iso_upper)
+    if calc:
+        result.update(calc(ref, zone))
+    return result
+
 
 class CapacityMarketIngestor:
     """
@@ -149,10 +279,10 @@ class CapacityMarketIngestor:
       - get_capacity_summary(): Summary for pipeline scoring
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, client: Optional[APIClient] = None):
         self.config = config
         self.api_keys = config.get("api_keys", {})
-        self.client = APIClient(
+        self.client = client or get_client(
             cache_dir=config.get("cache", {}).get("directory", "./data/cache"),
             cache_enabled=config.get("cache", {}).get("enabled", True),
         )
@@ -176,19 +306,7 @@ class CapacityMarketIngestor:
         pjm_key = self.api_keys.get("pjm", "")
         if not pjm_key:
             logger.info("  PJM RPM: No API key — using reference prices only")
-            # Return reference data as DataFrame
-            rows = []
-            for dy, zones in CAPACITY_PRICES_REFERENCE["PJM"]["delivery_years"].items():
-                for zone, price in zones.items():
-                    if zone in ("units", "note"):
-                        continue
-                    rows.append({
-                        "delivery_year": dy,
-                        "zone": zone,
-                        "clearing_price_mw_day": price,
-                        "iso": "PJM",
-                    })
-            return pd.DataFrame(rows)
+            return PJM_RPM_REFERENCE.copy()
 
         try:
             url = "https://dataminer2.pjm.com/feed/rpm_auction_results"
@@ -212,18 +330,7 @@ class CapacityMarketIngestor:
             logger.warning(f"  PJM RPM data fetch failed: {e}")
 
         # Fallback to reference
-        rows = []
-        for dy, zones in CAPACITY_PRICES_REFERENCE["PJM"]["delivery_years"].items():
-            for zone, price in zones.items():
-                if zone in ("units", "note"):
-                    continue
-                rows.append({
-                    "delivery_year": dy,
-                    "zone": zone,
-                    "clearing_price_mw_day": price,
-                    "iso": "PJM",
-                })
-        return pd.DataFrame(rows)
+        return PJM_RPM_REFERENCE.copy()
 
     def get_annual_capacity_revenue(self, iso: str, zone: Optional[str] = None) -> Dict:
         """
@@ -234,73 +341,7 @@ class CapacityMarketIngestor:
           - annual_revenue_per_mw: Estimated annual $ per MW installed
           - price_trend: Direction (increasing/stable/decreasing)
         """
-        iso_upper = iso.upper()
-        ref = CAPACITY_PRICES_REFERENCE.get(iso_upper, {})
-
-        if not ref:
-            return {"iso": iso_upper, "has_capacity_market": False}
-
-        result = {
-            "iso": iso_upper,
-            "auction_type": ref.get("auction_type", "Unknown"),
-            "has_capacity_market": iso_upper in ("PJM", "NYISO", "ISONE", "MISO"),
-        }
-
-        if iso_upper == "PJM":
-            # Use most recent delivery year
-            latest = list(ref.get("delivery_years", {}).values())
-            if latest:
-                dy = latest[-1]
-                price = dy.get("RTO_avg", 0)
-                if zone and zone in dy:
-                    price = dy[zone]
-                result["capacity_price_mw_day"] = price
-                result["annual_revenue_per_mw"] = round(price * 365, 0)
-                result["units"] = "$/MW-day"
-
-        elif iso_upper == "NYISO":
-            zones_data = ref.get("zones", {})
-            target_zone = zone or "Rest_of_State"
-            zd = zones_data.get(target_zone, {})
-            summer = zd.get("summer_2025", 0)
-            winter = zd.get("winter_2025", 0)
-            # Average monthly * 12 months * 1000 (kW to MW)
-            avg_monthly = (summer + winter) / 2
-            result["capacity_price_kw_month"] = avg_monthly
-            result["annual_revenue_per_mw"] = round(avg_monthly * 12 * 1000, 0)
-            result["units"] = "$/kW-month"
-
-        elif iso_upper == "ISONE":
-            auctions = ref.get("auctions", {})
-            latest = list(auctions.values())[-1] if auctions else {}
-            price = latest.get("clearing_price", 0)
-            result["capacity_price_kw_month"] = price
-            result["annual_revenue_per_mw"] = round(price * 12 * 1000, 0)
-            result["units"] = "$/kW-month"
-
-        elif iso_upper == "MISO":
-            zones_data = ref.get("zones", {})
-            target_zone = zone or "Zone_1"
-            zd = zones_data.get(target_zone, {})
-            price = zd.get("2025", 0)
-            result["capacity_price_mw_day"] = price
-            result["annual_revenue_per_mw"] = round(price * 365, 0)
-            result["units"] = "$/MW-day"
-
-        elif iso_upper == "ERCOT":
-            result["mechanism"] = "ORDC"
-            result["note"] = ref.get("note", "")
-            result["avg_ordc_adder"] = ref.get("avg_ordc_adder_2024", 0)
-
-        elif iso_upper == "CAISO":
-            ra = ref.get("estimated_ra_value_2025", {})
-            price = ra.get("system_avg", 0)
-            result["capacity_price_kw_month"] = price
-            result["annual_revenue_per_mw"] = round(price * 12 * 1000, 0)
-            result["mechanism"] = "bilateral RA"
-            result["units"] = "$/kW-month"
-
-        return result
+        return dict(_annual_capacity_revenue(iso.upper(), zone))
 
     def get_capacity_summary(self) -> Dict:
         """Generate capacity market summary for pipeline output."""
@@ -315,16 +356,25 @@ class CapacityMarketIngestor:
             summary["annual_revenue_estimates"][iso] = rev
 
         # Rank by revenue potential
-        ranked = sorted(
-            [
-                (iso, data.get("annual_revenue_per_mw", 0))
-                for iso, data in summary["annual_revenue_estimates"].items()
-            ],
-            key=lambda x: x[1],
-            reverse=True,
+        # (sort a float view, but emit the estimates' own values so energy-only
+        # ISOs keep their int 0 rather than a coerced 0.0)
+        ranking = pd.DataFrame(
+            {
+                "iso": list(summary["annual_revenue_estimates"]),
+                "annual_$/MW": pd.Series(
+                    [
+                        data.get("annual_revenue_per_mw", 0)
+                        for data in summary["annual_revenue_estimates"].values()
+                    ],
+                    dtype=object,
+                ),
+            }
+        )
+        order = (
+            ranking["annual_$/MW"].astype("float64")
+            .sort_values(ascending=False, kind="stable")
+            .index
         )
-        summary["revenue_ranking"] = [
-            {"iso": iso, "annual_$/MW": rev} for iso, rev in ranked
-        ]
+        summary["revenue_ranking"] = ranking.loc[order].to_dict("records")
 
         return summary
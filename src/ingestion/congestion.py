@@ -17,6 +17,8 @@ Congestion tells us which corridors are bottlenecked:
 
 import logging
 import io
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict
 from pathlib import Path
@@ -24,7 +26,10 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 
-from ..utils.api_client import APIClient
+from ..utils.api_client import APIClient, get_client
+from ..utils.cache import CACHE_SUFFIX, atomic_write_df, cache_age, existing_cache, read_cached_df
+from ..utils.frames import CSV_ENGINE, concat_days, report_dates
+from ..utils.oasis import read_zipped_csv
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +38,62 @@ CAISO_OASIS_BASE = "https://oasis.caiso.com/oasisapi/SingleZip"
 PJM_DATAMINER_BASE = "https://dataminer2.pjm.com/feed"
 MISO_MARKET_BASE = "https://docs.misoenergy.org/marketreports"
 
+# Column names the LMP congestion component appears under, by preference
+CONGESTION_COLUMNS = ("congestion", "MCC", "mcc", "Marginal Cost Congestion ($/MWHr)")
+
+# |MCC| severity bands ($/MWh): upper edges of Minimal..High, then Severe
+SEVERITY_EDGES = np.array([2, 5, 15, 50], dtype=np.float64)
+SEVERITY_DTYPE = pd.CategoricalDtype(
+    ["Minimal", "Low", "Moderate", "High", "Severe"], ordered=True
+)
+
+# Concurrent downloads for per-day market reports
+MAX_DAY_WORKERS = 8
+
+# Shared category list keeps ``iso`` categorical through cross-ISO concats
+ISO_DTYPE = pd.CategoricalDtype(["CAISO", "PJM", "MISO", "ERCOT", "SPP", "NYISO"])
+
+# PRC_LMP columns kept from OASIS (the value is MW or VALUE by version);
+# the repeated identifiers parse straight to categoricals
+CAISO_LMP_COLUMNS = frozenset(
+    {"INTERVALSTARTTIME_GMT", "OPR_DT", "NODE", "NODE_ID", "LMP_TYPE", "MW", "VALUE"}
+)
+CAISO_LMP_DTYPES = {
+    "NODE": "category",
+    "NODE_ID": "category",
+    "LMP_TYPE": "category",
+}
+
+
+def _tag_iso(df: pd.DataFrame, iso: str) -> pd.DataFrame:
+    """Add the categorical ``iso`` column."""
+    df["iso"] = pd.Categorical([iso] * len(df), dtype=ISO_DTYPE)
+    return df
+
+
+def _congestion_column(lmp_df: pd.DataFrame) -> Optional[str]:
+    """Name of the congestion component column in an LMP frame, if any."""
+    cols = set(lmp_df.columns)
+    return next((c for c in CONGESTION_COLUMNS if c in cols), None)
+
+
+def _rank_corridors(congested: pd.DataFrame, top_n: Optional[int] = None) -> pd.DataFrame:
+    """
+    Order congested nodes by congestion_pct, highest first.
+
+    iso/node break ties so the ranking does not depend on group order. With
+    ``top_n`` only the leading rows are selected (plus any tied at the
+    cut-off) before sorting, instead of sorting every node.
+    """
+    if congested.empty:
+        return congested
+    if top_n is not None:
+        congested = congested.nlargest(top_n, "congestion_pct", keep="all")
+    ranked = congested.sort_values(
+        ["congestion_pct", "iso", "node"], ascending=[False, True, True]
+    )
+    return ranked if top_n is None else ranked.head(top_n)
+
 
 class CongestionIngestor:
     """
@@ -47,10 +108,10 @@ class CongestionIngestor:
       - identify_congested_corridors(): Find persistently congested areas
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, client: Optional[APIClient] = None):
         self.config = config
         self.api_keys = config.get("api_keys", {})
-        self.client = APIClient(
+        self.client = client or get_client(
             cache_dir=config.get("cache", {}).get("directory", "./data/cache"),
             cache_enabled=config.get("cache", {}).get("enabled", True),
         )
@@ -61,6 +122,7 @@ class CongestionIngestor:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         self._congestion_data = {}
+        self._congestion_data_lock = threading.Lock()
 
     # ── Extract congestion from LMP data ──────────────────────────
 
@@ -76,32 +138,36 @@ class CongestionIngestor:
         if lmp_df.empty:
             return pd.DataFrame()
 
-        cong_col = None
-        for c in ["congestion", "MCC", "mcc", "Marginal Cost Congestion ($/MWHr)"]:
-            if c in lmp_df.columns:
-                cong_col = c
-                break
-
+        cong_col = _congestion_column(lmp_df)
         if not cong_col:
             logger.info("  No congestion column in LMP data")
             return pd.DataFrame()
 
-        df = lmp_df.copy()
-        df["congestion_value"] = pd.to_numeric(df[cong_col], errors="coerce")
-        df = df.dropna(subset=["congestion_value"])
-
-        if df.empty:
+        # A column of a frame built from a row-major 2D array is a strided
+        # view; make the hot column contiguous before the passes below.
+        vals = np.ascontiguousarray(
+            pd.to_numeric(lmp_df[cong_col], errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+        )
+        valid = ~np.isnan(vals)
+        if not valid.any():
             return pd.DataFrame()
 
-        # Flag significant congestion (|MCC| > $5/MWh is notable)
-        df["is_congested"] = df["congestion_value"].abs() > 5
-        df["congestion_severity"] = pd.cut(
-            df["congestion_value"].abs(),
-            bins=[0, 2, 5, 15, 50, float("inf")],
-            labels=["Minimal", "Low", "Moderate", "High", "Severe"],
-        )
+        vals = vals[valid]
+        abs_vals = np.abs(vals)
 
-        return df
+        # Severity bins are right-closed like pd.cut: (0, 2], (2, 5], ...;
+        # an exact zero falls outside the first bin and stays missing.
+        codes = np.searchsorted(SEVERITY_EDGES, abs_vals, side="left").astype(np.int8)
+        codes[abs_vals == 0] = -1
+
+        return lmp_df[valid].assign(
+            congestion_value=vals,
+            # Flag significant congestion (|MCC| > $5/MWh is notable)
+            is_congested=abs_vals > 5,
+            congestion_severity=pd.Categorical.from_codes(codes, dtype=SEVERITY_DTYPE),
+        )
 
     # ── CAISO Binding Constraints ─────────────────────────────────
 
@@ -123,29 +189,23 @@ class CongestionIngestor:
                 "market_run_id": "DAM",
             }
 
-            cache_file = self.cache_dir / f"caiso_constraints_{days_back}d.csv"
-            import time
-            if cache_file.exists():
-                age_hours = (time.time() - cache_file.stat().st_mtime) / 3600
-                if age_hours < 24:
-                    logger.info("  CAISO constraints: using cached data")
-                    return pd.read_csv(cache_file)
+            cache_file = self.cache_dir / f"caiso_constraints_{days_back}d{CACHE_SUFFIX}"
+            cached = existing_cache(cache_file)
+            if cached is not None and cache_age(cached) < 24 * 3600:
+                logger.info("  CAISO constraints: using cached data")
+                return _tag_iso(read_cached_df(cached, engine=CSV_ENGINE), "CAISO")
 
-            import zipfile
             logger.info("  CAISO: fetching binding constraints...")
             response = self.client.session.get(
-                CAISO_OASIS_BASE, params=params, timeout=120
+                CAISO_OASIS_BASE, params=params, timeout=120, stream=True
             )
             response.raise_for_status()
 
-            z = zipfile.ZipFile(io.BytesIO(response.content))
-            csv_name = z.namelist()[0]
-            with z.open(csv_name) as f:
-                df = pd.read_csv(f)
+            df = read_zipped_csv(response, engine=CSV_ENGINE)
 
-            df.to_csv(cache_file, index=False)
+            atomic_write_df(cache_file, df)
 
-            df["iso"] = "CAISO"
+            _tag_iso(df, "CAISO")
             logger.info(f"  CAISO constraints: {len(df)} records")
             return df
 
@@ -173,22 +233,22 @@ class CongestionIngestor:
                 "grp_type": "ALL_APNODES",
             }
 
-            cache_file = self.cache_dir / f"caiso_cong_comp_{days_back}d.csv"
-            import time
-            if cache_file.exists():
-                age = (time.time() - cache_file.stat().st_mtime) / 3600
-                if age < 24:
-                    return pd.read_csv(cache_file)
+            cache_file = self.cache_dir / f"caiso_cong_comp_{days_back}d{CACHE_SUFFIX}"
+            cached = existing_cache(cache_file)
+            if cached is not None and cache_age(cached) < 24 * 3600:
+                return _tag_iso(read_cached_df(cached, engine=CSV_ENGINE), "CAISO")
 
-            import zipfile
             response = self.client.session.get(
-                CAISO_OASIS_BASE, params=params, timeout=120
+                CAISO_OASIS_BASE, params=params, timeout=120, stream=True
             )
             response.raise_for_status()
 
-            z = zipfile.ZipFile(io.BytesIO(response.content))
-            with z.open(z.namelist()[0]) as f:
-                df = pd.read_csv(f)
+            df = read_zipped_csv(
+                response,
+                columns=CAISO_LMP_COLUMNS,
+                engine=CSV_ENGINE,
+                dtype=CAISO_LMP_DTYPES,
+            )
 
             # Filter to congestion component only
             if "LMP_TYPE" in df.columns:
@@ -196,9 +256,8 @@ class CongestionIngestor:
             else:
                 cong = df
 
-            cong.to_csv(cache_file, index=False)
-            cong["iso"] = "CAISO"
-            return cong
+            atomic_write_df(cache_file, cong)
+            return _tag_iso(cong, "CAISO")
 
         except Exception as e:
             logger.warning(f"  CAISO congestion component fetch failed: {e}")
@@ -238,7 +297,7 @@ class CongestionIngestor:
                 return pd.DataFrame()
 
             df = pd.DataFrame(records)
-            df["iso"] = "PJM"
+            _tag_iso(df, "PJM")
             logger.info(f"  PJM constraints: {len(df)} binding constraint records")
             return df
 
@@ -253,37 +312,21 @@ class CongestionIngestor:
         Fetch MISO binding constraint reports from public market reports.
         """
         try:
+            dates = report_dates(min(days_back, 7))
+
+            # Daily reports are independent — fetch them concurrently
             frames = []
-            end_date = datetime.now()
-
-            for i in range(min(days_back, 7)):
-                dt = end_date - timedelta(days=i)
-                date_str = dt.strftime("%Y%m%d")
-
-                url = f"{MISO_MARKET_BASE}/{date_str}_da_bc.csv"
-
-                cache_file = self.cache_dir / f"miso_bc_{date_str}.csv"
-                if cache_file.exists():
-                    try:
-                        frames.append(pd.read_csv(cache_file))
-                        continue
-                    except Exception:
-                        pass
-
-                try:
-                    response = self.client.session.get(url, timeout=30)
-                    if response.status_code == 200:
-                        df = pd.read_csv(io.StringIO(response.text))
-                        df.to_csv(cache_file, index=False)
-                        frames.append(df)
-                except Exception:
-                    continue
+            if dates:
+                workers = min(MAX_DAY_WORKERS, len(dates))
+                with ThreadPoolExecutor(max_workers=workers) as ex:
+                    results = ex.map(self._fetch_miso_bc_day, dates)
+                    frames = [f for f in results if f is not None]
 
             if not frames:
                 return pd.DataFrame()
 
-            df = pd.concat(frames, ignore_index=True)
-            df["iso"] = "MISO"
+            df = concat_days(frames)
+            _tag_iso(df, "MISO")
             logger.info(f"  MISO constraints: {len(df)} binding constraint records")
             return df
 
@@ -291,6 +334,28 @@ class CongestionIngestor:
             logger.warning(f"  MISO constraint fetch failed: {e}")
             return pd.DataFrame()
 
+    def _fetch_miso_bc_day(self, date_str: str) -> Optional[pd.DataFrame]:
+        """Load one day's MISO binding constraint report from cache or the web."""
+        url = f"{MISO_MARKET_BASE}/{date_str}_da_bc.csv"
+
+        cache_file = self.cache_dir / f"miso_bc_{date_str}{CACHE_SUFFIX}"
+        cached = existing_cache(cache_file)
+        if cached is not None:
+            try:
+                return read_cached_df(cached, engine=CSV_ENGINE)
+            except Exception:
+                pass
+
+        try:
+            response = self.client.get_response(url, timeout=30)
+            if response.status_code == 200:
+                df = pd.read_csv(io.BytesIO(response.content), engine=CSV_ENGINE)
+                atomic_write_df(cache_file, df)
+                return df
+        except Exception:
+            pass
+        return None
+
     # ── Public interface ──────────────────────────────────────────
 
     def get_congestion_by_iso(self, iso_name: str, days_back: int = 7) -> pd.DataFrame:
@@ -311,7 +376,8 @@ class CongestionIngestor:
 
         df = method()
         if not df.empty:
-            self._congestion_data[iso_upper] = df
+            with self._congestion_data_lock:
+                self._congestion_data[iso_upper] = df
         return df
 
     def get_all_congestion(
@@ -323,18 +389,31 @@ class CongestionIngestor:
         if isos is None:
             isos = ["CAISO", "PJM", "MISO"]
 
-        frames = []
-        for iso in isos:
-            df = self.get_congestion_by_iso(iso, days_back=days_back)
-            if not df.empty:
-                frames.append(df)
+        if not isos:
+            return pd.DataFrame()
+
+        # ISO fetches are independent blocking HTTP calls — run them side
+        # by side so wall time is the slowest ISO rather than the sum.
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(isos)) as ex:
+            futs = {
+                ex.submit(self.get_congestion_by_iso, iso, days_back): iso
+                for iso in isos
+            }
+            for fut in as_completed(futs):
+                df = fut.result()
+                if not df.empty:
+                    results[futs[fut]] = df
 
+        # Keep the combined frame in the requested ISO order
+        frames = [results[iso] for iso in isos if iso in results]
         return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
     def identify_congested_corridors(
         self,
         lmp_df: pd.DataFrame,
         threshold_pct: float = 10.0,
+        top_n: Optional[int] = None,
     ) -> pd.DataFrame:
         """
         Identify persistently congested corridors from LMP data.
@@ -342,17 +421,34 @@ class CongestionIngestor:
         Args:
             lmp_df: LMP DataFrame with congestion component
             threshold_pct: % of hours that must be congested to qualify
+            top_n: Return only the N most congested nodes (default: all)
 
         Returns:
-            DataFrame of corridors/nodes with persistent congestion.
+            DataFrame of corridors/nodes with persistent congestion,
+            most congested first.
         """
-        cong_df = self.get_congestion_from_lmp(lmp_df)
-        if cong_df.empty or "node" not in cong_df.columns:
+        return _rank_corridors(self._congested_nodes(lmp_df, threshold_pct), top_n)
+
+    def _congested_nodes(self, lmp_df: pd.DataFrame, threshold_pct: float) -> pd.DataFrame:
+        """Per-node congestion stats for nodes over the threshold, unranked."""
+        if lmp_df.empty or not {"iso", "node"}.issubset(lmp_df.columns):
+            return pd.DataFrame()
+        cong_col = _congestion_column(lmp_df)
+        if not cong_col:
+            logger.info("  No congestion column in LMP data")
+            return pd.DataFrame()
+
+        # Only the group keys and the congestion column feed the stats, so
+        # don't carry (and mask) the rest of a wide LMP frame through.
+        cong_df = self.get_congestion_from_lmp(lmp_df[["iso", "node", cong_col]])
+        if cong_df.empty:
             return pd.DataFrame()
 
-        # Group by node and calculate congestion frequency
+        # Group by node and calculate congestion frequency. Group order is
+        # irrelevant (callers rank the result), so skip the key sort.
         node_stats = (
-            cong_df.groupby(["iso", "node"])
+            cong_df.assign(is_congested=cong_df["is_congested"].astype(np.uint8))
+            .groupby(["iso", "node"], sort=False, observed=True, as_index=False)
             .agg(
                 total_hours=("congestion_value", "count"),
                 congested_hours=("is_congested", "sum"),
@@ -361,7 +457,6 @@ class CongestionIngestor:
                 min_congestion=("congestion_value", "min"),
                 std_congestion=("congestion_value", "std"),
             )
-            .reset_index()
         )
 
         node_stats["congestion_pct"] = (
@@ -369,9 +464,7 @@ class CongestionIngestor:
         ).round(1)
 
         # Filter to persistently congested
-        congested = node_stats[
-            node_stats["congestion_pct"] >= threshold_pct
-        ].sort_values("congestion_pct", ascending=False)
+        congested = node_stats[node_stats["congestion_pct"] >= threshold_pct]
 
         logger.info(
             f"  Found {len(congested)} persistently congested nodes "
@@ -389,12 +482,14 @@ class CongestionIngestor:
         }
 
         if lmp_df is not None and not lmp_df.empty:
-            corridors = self.identify_congested_corridors(lmp_df)
-            if not corridors.empty:
-                summary["persistently_congested_nodes"] = len(corridors)
-                summary["top_congested_nodes"] = (
-                    corridors.head(20)
-                    .to_dict("records")
-                )
+            congested = self._congested_nodes(lmp_df, threshold_pct=10.0)
+            if not congested.empty:
+                summary["persistently_congested_nodes"] = len(congested)
+                corridors = _rank_corridors(congested, top_n=20)
+                cols = corridors.columns.tolist()
+                summary["top_congested_nodes"] = [
+                    dict(zip(cols, row))
+                    for row in corridors.itertuples(index=False, name=None)
+                ]
 
         return summary
@@ -16,14 +16,22 @@ High curtailment areas = BESS opportunity:
 
 import logging
 import io
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, List, Dict
 from pathlib import Path
 
 import pandas as pd
 import numpy as np
 
-from ..utils.api_client import APIClient
+from ..utils.api_client import APIClient, get_client
+from ..utils.cache import CACHE_SUFFIX, atomic_write_df, cache_age, existing_cache, read_cached_df
+from ..utils.frames import CSV_ENGINE, concat_days, report_dates
+from ..utils.oasis import read_zipped_csv
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +41,40 @@ CAISO_CURTAILMENT_BASE = "http://www.caiso.com/outlook/SP/History"
 ERCOT_DATA_BASE = "https://www.ercot.com/content/cdr/html"
 MISO_MARKET_BASE = "https://docs.misoenergy.org/marketreports"
 
+# Concurrent downloads for per-day market reports
+MAX_DAY_WORKERS = 8
+
+# Column-name fragments identifying ERCOT HSL and actual-output columns
+HSL_KEYWORDS = ("hsl", "high sustained", "capacity")
+GEN_KEYWORDS = ("actual", "generation", "output")
+
+# SLD_REN_FCST identifier columns repeat on every interval — parse them
+# straight to categoricals
+CAISO_RENEWABLE_DTYPES = {
+    "TRADING_HUB": "category",
+    "RENEWABLE_TYPE": "category",
+    "MARKET_RUN_ID": "category",
+}
+
 # ── Reference curtailment data ────────────────────────────────────
-# Annual curtailment by ISO (GWh) — from public reports
-CURTAILMENT_REFERENCE = {
+
+def _frozen(value):
+    """Read-only view of a nested dict — every level wrapped in MappingProxyType."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _frozen(v) for k, v in value.items()})
+    return value
+
+
+def _thawed(value):
+    """Plain nested dict copy of a _frozen mapping, safe to hand to callers."""
+    if isinstance(value, Mapping):
+        return {k: _thawed(v) for k, v in value.items()}
+    return value
+
+
+# Annual curtailment by ISO (GWh) — from public reports. Read-only at every
+# level so the memoized scores below can't go stale.
+CURTAILMENT_REFERENCE = _frozen({
     "CAISO": {
         "2023": {"solar_gwh": 2436, "wind_gwh": 184, "total_gwh": 2620},
         "2024": {"solar_gwh": 2800, "wind_gwh": 200, "total_gwh": 3000},
@@ -80,7 +119,73 @@ CURTAILMENT_REFERENCE = {
         "trend": "increasing with offshore wind buildout",
         "bess_value": "Growing — offshore wind will increase curtailment",
     },
-}
+})
+
+# Largest annual total in the reference — the 100-point scoring anchor
+_MAX_CURT_GWH = max(
+    year.get("total_gwh", 0)
+    for iso_ref in CURTAILMENT_REFERENCE.values()
+    for year in iso_ref.values()
+    if isinstance(year, Mapping)
+)
+
+# Score adjustment for the curtailment trend
+_TREND_BONUS = MappingProxyType({
+    "increasing rapidly": 15,
+    "increasing": 10,
+    "stable to increasing": 5,
+    "stable": 0,
+    "decreasing": -10,
+})
+
+
+def _last_matching_column(lower_cols: Dict[str, str], keywords) -> Optional[str]:
+    """Last column whose lowercased name contains any of ``keywords``."""
+    matches = [c for cl, c in lower_cols.items() if any(k in cl for k in keywords)]
+    return matches[-1] if matches else None
+
+
+@lru_cache(maxsize=None)
+def _score_curtailment(iso_upper: str) -> Dict:
+    """
+    Curtailment opportunity score for one ISO, memoized.
+
+    Reads only CURTAILMENT_REFERENCE, so the result depends on the ISO
+    alone. Callers get a shallow copy via
+    CurtailmentIngestor.score_curtailment_opportunity.
+    """
+    ref = CURTAILMENT_REFERENCE.get(iso_upper, {})
+
+    if not ref:
+        return {
+            "iso": iso_upper,
+            "curtailment_score": 0,
+            "note": "No curtailment data available",
+        }
+
+    # Get latest year data
+    latest_year = "2024"
+    yearly = ref.get(latest_year, ref.get("2023", {}))
+    total_gwh = yearly.get("total_gwh", 0)
+    trend = ref.get("trend", "unknown")
+
+    # Score: highest reference curtailment = 100, scale others proportionally
+    raw_score = min(100, (total_gwh / _MAX_CURT_GWH) * 100)
+    trend_bonus = _TREND_BONUS.get(trend, 0)
+
+    score = min(100, max(0, raw_score + trend_bonus))
+
+    return {
+        "iso": iso_upper,
+        "curtailment_score": round(score, 1),
+        "annual_curtailment_gwh": total_gwh,
+        "trend": trend,
+        "peak_hours": ref.get("peak_hours", ""),
+        "primary_cause": ref.get("primary_cause", ""),
+        "bess_value": ref.get("bess_value", ""),
+        "solar_gwh": yearly.get("solar_gwh", 0),
+        "wind_gwh": yearly.get("wind_gwh", 0),
+    }
 
 
 class CurtailmentIngestor:
@@ -96,10 +201,10 @@ class CurtailmentIngestor:
       - score_curtailment_opportunity(): Score a location for BESS value
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, client: Optional[APIClient] = None):
         self.config = config
         self.api_keys = config.get("api_keys", {})
-        self.client = APIClient(
+        self.client = client or get_client(
             cache_dir=config.get("cache", {}).get("directory", "./data/cache"),
             cache_enabled=config.get("cache", {}).get("enabled", True),
         )
@@ -108,6 +213,7 @@ class CurtailmentIngestor:
         )
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self._curtailment_data = {}
+        self._curtailment_data_lock = threading.Lock()
 
     # ── CAISO Curtailment ─────────────────────────────────────────
 
@@ -130,30 +236,28 @@ class CurtailmentIngestor:
                 "market_run_id": "ACTUAL",
             }
 
-            cache_file = self.cache_dir / f"caiso_curtailment_{days_back}d.csv"
-            import time
-            if cache_file.exists():
-                age = (time.time() - cache_file.stat().st_mtime) / 3600
-                if age < 24:
-                    df = pd.read_csv(cache_file)
-                    df["iso"] = "CAISO"
-                    return df
+            cache_file = self.cache_dir / f"caiso_curtailment_{days_back}d{CACHE_SUFFIX}"
+            cached = existing_cache(cache_file)
+            if cached is not None and cache_age(cached) < 24 * 3600:
+                df = read_cached_df(cached, engine=CSV_ENGINE)
+                df["iso"] = "CAISO"
+                return df
 
-            import zipfile
             logger.info("  CAISO: fetching renewable curtailment data...")
             response = self.client.session.get(
-                CAISO_OASIS_BASE, params=params, timeout=120
+                CAISO_OASIS_BASE, params=params, timeout=120, stream=True
             )
             response.raise_for_status()
 
-            z = zipfile.ZipFile(io.BytesIO(response.content))
-            with z.open(z.namelist()[0]) as f:
-                df = pd.read_csv(f)
+            df = read_zipped_csv(
+                response, engine=CSV_ENGINE, dtype=CAISO_RENEWABLE_DTYPES
+            )
 
-            df.to_csv(cache_file, index=False)
+            atomic_write_df(cache_file, df)
             df["iso"] = "CAISO"
             logger.info(f"  CAISO curtailment: {len(df)} records")
-            self._curtailment_data["CAISO"] = df
+            with self._curtailment_data_lock:
+                self._curtailment_data["CAISO"] = df
             return df
 
         except Exception as e:
@@ -169,49 +273,35 @@ class CurtailmentIngestor:
         ERCOT posts hourly wind/solar reports.
         """
         try:
-            frames = []
-            end_date = datetime.now()
-
-            for i in range(min(days_back, 30)):
-                dt = end_date - timedelta(days=i)
-                date_str = dt.strftime("%Y%m%d")
-
-                # ERCOT wind generation report
-                url = f"{ERCOT_DATA_BASE}/{date_str}_wind_gen.csv"
-
-                cache_file = self.cache_dir / f"ercot_wind_{date_str}.csv"
-                if cache_file.exists():
-                    try:
-                        frames.append(pd.read_csv(cache_file))
-                        continue
-                    except Exception:
-                        pass
-
-                try:
-                    response = self.client.session.get(url, timeout=30)
-                    if response.status_code == 200:
-                        df = pd.read_csv(io.StringIO(response.text))
-                        df["date"] = date_str
-                        df.to_csv(cache_file, index=False)
-                        frames.append(df)
-                except Exception:
-                    continue
+            dates = report_dates(min(days_back, 30))
+
+            # Daily reports are independent — fetch them concurrently
+            days, frames = [], []
+            if dates:
+                workers = min(MAX_DAY_WORKERS, len(dates))
+                with ThreadPoolExecutor(max_workers=workers) as ex:
+                    results = ex.map(self._fetch_ercot_wind_day, dates)
+                    for date_str, f in zip(dates, results):
+                        if f is not None:
+                            days.append(date_str)
+                            frames.append(f)
 
             if not frames:
                 logger.warning("  ERCOT: no wind generation data retrieved")
                 return pd.DataFrame()
 
-            df = pd.concat(frames, ignore_index=True)
+            df = concat_days(frames)
+            # The report date lives in the file name, not the report body —
+            # attach it once for all days rather than per cached frame
+            df["date"] = pd.Categorical.from_codes(
+                np.repeat(np.arange(len(days)), [len(f) for f in frames]),
+                categories=days,
+            )
 
             # Calculate curtailment if HSL columns present
-            hsl_col = None
-            gen_col = None
-            for c in df.columns:
-                cl = c.lower()
-                if "hsl" in cl or "high sustained" in cl or "capacity" in cl:
-                    hsl_col = c
-                if "actual" in cl or "generation" in cl or "output" in cl:
-                    gen_col = c
+            lower_cols = {str(c).lower(): c for c in df.columns}
+            hsl_col = _last_matching_column(lower_cols, HSL_KEYWORDS)
+            gen_col = _last_matching_column(lower_cols, GEN_KEYWORDS)
 
             if hsl_col and gen_col:
                 df["curtailed_mw"] = (
@@ -221,32 +311,53 @@ class CurtailmentIngestor:
 
             df["iso"] = "ERCOT"
             logger.info(f"  ERCOT wind generation: {len(df)} records")
-            self._curtailment_data["ERCOT"] = df
+            with self._curtailment_data_lock:
+                self._curtailment_data["ERCOT"] = df
             return df
 
         except Exception as e:
             logger.warning(f"  ERCOT curtailment fetch failed: {e}")
             return pd.DataFrame()
 
+    def _fetch_ercot_wind_day(self, date_str: str) -> Optional[pd.DataFrame]:
+        """Load one day's ERCOT wind generation report from cache or the web."""
+        # ERCOT wind generation report
+        url = f"{ERCOT_DATA_BASE}/{date_str}_wind_gen.csv"
+
+        cache_file = self.cache_dir / f"ercot_wind_{date_str}{CACHE_SUFFIX}"
+        cached = existing_cache(cache_file)
+        if cached is not None:
+            try:
+                return read_cached_df(cached, engine=CSV_ENGINE)
+            except Exception:
+                pass
+
+        try:
+            response = self.client.get_response(url, timeout=30)
+            if response.status_code == 200:
+                df = pd.read_csv(io.BytesIO(response.content), engine=CSV_ENGINE)
+                atomic_write_df(cache_file, df)
+                return df
+        except Exception:
+            pass
+        return None
+
     # ── Public interface ──────────────────────────────────────────
 
     def get_curtailment_reference(self) -> Dict:
         """Return reference curtailment data by ISO."""
-        return CURTAILMENT_REFERENCE
+        return _thawed(CURTAILMENT_REFERENCE)
 
     def get_all_curtailment(self, days_back: int = 30) -> Dict:
         """Fetch curtailment data from all ISOs where available."""
-        results = {}
-
-        caiso = self.get_caiso_curtailment(days_back=days_back)
-        if not caiso.empty:
-            results["CAISO"] = caiso
-
-        ercot = self.get_ercot_curtailment(days_back=days_back)
-        if not ercot.empty:
-            results["ERCOT"] = ercot
+        # CAISO and ERCOT fetches are independent network calls — run them
+        # side by side so wall time is the slower of the two, not the sum.
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            caiso_fut = ex.submit(self.get_caiso_curtailment, days_back)
+            ercot_fut = ex.submit(self.get_ercot_curtailment, days_back)
+            fetched = {"CAISO": caiso_fut.result(), "ERCOT": ercot_fut.result()}
 
-        return results
+        return {iso: df for iso, df in fetched.items() if not df.empty}
 
     def score_curtailment_opportunity(self, iso: str) -> Dict:
         """
@@ -258,53 +369,12 @@ class CurtailmentIngestor:
           - trend: increasing/stable/decreasing
           - revenue_potential: qualitative assessment
         """
-        iso_upper = iso.upper()
-        ref = CURTAILMENT_REFERENCE.get(iso_upper, {})
-
-        if not ref:
-            return {
-                "iso": iso_upper,
-                "curtailment_score": 0,
-                "note": "No curtailment data available",
-            }
-
-        # Get latest year data
-        latest_year = "2024"
-        yearly = ref.get(latest_year, ref.get("2023", {}))
-        total_gwh = yearly.get("total_gwh", 0)
-        trend = ref.get("trend", "unknown")
-
-        # Score: CAISO (highest) = 100, scale others proportionally
-        # Max reference is ~3000 GWh (CAISO)
-        raw_score = min(100, (total_gwh / 3000) * 100)
-
-        # Trend bonus
-        trend_bonus = {
-            "increasing rapidly": 15,
-            "increasing": 10,
-            "stable to increasing": 5,
-            "stable": 0,
-            "decreasing": -10,
-        }.get(trend, 0)
-
-        score = min(100, max(0, raw_score + trend_bonus))
-
-        return {
-            "iso": iso_upper,
-            "curtailment_score": round(score, 1),
-            "annual_curtailment_gwh": total_gwh,
-            "trend": trend,
-            "peak_hours": ref.get("peak_hours", ""),
-            "primary_cause": ref.get("primary_cause", ""),
-            "bess_value": ref.get("bess_value", ""),
-            "solar_gwh": yearly.get("solar_gwh", 0),
-            "wind_gwh": yearly.get("wind_gwh", 0),
-        }
+        return dict(_score_curtailment(iso.upper()))
 
     def get_curtailment_summary(self) -> Dict:
         """Generate curtailment summary for pipeline output."""
         summary = {
-            "reference_data": CURTAILMENT_REFERENCE,
+            "reference_data": _thawed(CURTAILMENT_REFERENCE),
             "iso_scores": {},
             "live_data_isos": list(self._curtailment_data.keys()),
         }
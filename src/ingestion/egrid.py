@@ -13,12 +13,26 @@ eGRID 2022 is the latest available as of Feb 2026.
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 from ..utils.api_client import APIClient
+from ..utils.cache import CACHE_SUFFIX, atomic_write_df, read_cached_df
+
+try:
+    import python_calamine  # noqa: F401  optional — native xlsx parser for read_excel
+    _EXCEL_ENGINE = "calamine"
+except ImportError:
+    _EXCEL_ENGINE = None  # pandas default (openpyxl)
+
+try:
+    from numba import njit  # optional — compiles the clean/dirty bucketing kernel
+except ImportError:
+    njit = None
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +41,7 @@ EGRID_DOWNLOAD_URL = (
     "https://www.epa.gov/system/files/documents/2024-01/"
     "egrid2022_data.xlsx"
 )
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
 
 # Key sheets in the eGRID workbook
 EGRID_SHEETS = {
@@ -62,6 +77,69 @@ PLANT_COLUMNS = {
     "NETEFX": "nerc_region",        # NERC region
 }
 
+# Numeric plant columns — coerced after parsing, so a stray non-numeric
+# cell (e.g. "--") becomes NaN instead of failing the whole sheet
+NUMERIC_PLANT_COLUMNS = [
+    "nameplate_mw", "annual_gen_mwh", "annual_co2_tons",
+    "annual_nox_tons", "annual_so2_tons", "co2_rate_lb_mwh",
+    "nox_rate_lb_mwh", "so2_rate_lb_mwh", "heat_rate_btu_kwh",
+    "capacity_factor", "lat", "lon",
+]
+
+# Low-cardinality text columns, parsed straight to categoricals
+CATEGORY_PLANT_COLUMNS = [
+    "state", "primary_fuel", "fuel_category", "egrid_subregion", "nerc_region",
+]
+PLANT_DTYPES = {
+    col: "category" for col, name in PLANT_COLUMNS.items()
+    if name in CATEGORY_PLANT_COLUMNS
+}
+
+# eGRID metrics joined onto EIA plants (float32 is ample for these)
+ENRICH_FLOAT_COLUMNS = [
+    "annual_gen_mwh", "annual_co2_tons",
+    "co2_rate_lb_mwh", "nox_rate_lb_mwh", "so2_rate_lb_mwh",
+    "heat_rate_btu_kwh", "capacity_factor",
+]
+
+
+def _bucket_totals_numpy(rate: np.ndarray, values: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Count and per-column totals for the clean (0), dirty (1) and unknown (2)
+    CO2-rate buckets, as a (3, 1 + n_columns) array.
+
+    NaN values are skipped in the totals, like Series.sum.
+    """
+    bucket = np.where(np.isnan(rate), 2, rate > threshold).astype(np.intp)
+    out = np.empty((3, 1 + values.shape[1]))
+    out[:, 0] = np.bincount(bucket, minlength=3)
+    for j in range(values.shape[1]):
+        col = values[:, j]
+        out[:, j + 1] = np.bincount(bucket, weights=np.where(np.isnan(col), 0.0, col), minlength=3)
+    return out
+
+
+def _bucket_totals_loop(rate: np.ndarray, values: np.ndarray, threshold: float) -> np.ndarray:
+    """Single-pass form of _bucket_totals_numpy, for compiling with numba."""
+    out = np.zeros((3, 1 + values.shape[1]))
+    for i in range(rate.shape[0]):
+        r = rate[i]
+        b = 2 if np.isnan(r) else (1 if r > threshold else 0)
+        out[b, 0] += 1
+        for j in range(values.shape[1]):
+            v = values[i, j]
+            if not np.isnan(v):
+                out[b, j + 1] += v
+    return out
+
+
+if njit is not None:
+    _bucket_totals = njit(cache=True)(_bucket_totals_loop)
+    # Compile at import so the first classification does not pay for it
+    _bucket_totals(np.zeros(1), np.zeros((1, 3)), 0.0)
+else:
+    _bucket_totals = _bucket_totals_numpy
+
 
 class EGRIDIngestor:
     """
@@ -86,6 +164,10 @@ class EGRIDIngestor:
         )
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self._plant_data: Optional[pd.DataFrame] = None
+        self._plant_index: Dict[int, int] = {}
+        self._by_state: Dict[str, pd.DataFrame] = {}
+        # plant_id -> emissions profile, filled by get_plant_emissions
+        self._emission_cache: Dict[int, dict] = {}
 
     def _download_egrid(self) -> Path:
         """
@@ -101,38 +183,26 @@ class EGRIDIngestor:
             return filepath
 
         logger.info("Downloading eGRID 2022 data from EPA (~30 MB)...")
+        # Stream to a temp file and move it into place, so the workbook is
+        # never held in memory and a failed download can't leave a
+        # truncated file that looks cached
+        tmp_path = filepath.with_suffix(filepath.suffix + ".tmp")
         try:
-            response = self.client.session.get(EGRID_DOWNLOAD_URL, timeout=120)
+            response = self.client.session.get(EGRID_DOWNLOAD_URL, timeout=120, stream=True)
             response.raise_for_status()
-            with open(filepath, "wb") as f:
-                f.write(response.content)
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                    f.write(chunk)
+            os.replace(tmp_path, filepath)
             logger.info(f"eGRID data saved to {filepath}")
             return filepath
         except Exception as e:
+            tmp_path.unlink(missing_ok=True)
             logger.error(f"Failed to download eGRID data: {e}")
             raise
 
-    def load_egrid_data(
-        self,
-        state_filter: Optional[str] = None,
-    ) -> pd.DataFrame:
-        """
-        Load plant-level data from the eGRID workbook.
-
-        Caches the parsed DataFrame in memory for repeated access.
-
-        Args:
-            state_filter: Two-letter state code or None for all
-
-        Returns:
-            DataFrame with standardized emissions and generation columns.
-        """
-        if self._plant_data is not None:
-            df = self._plant_data
-            if state_filter and state_filter != "ALL":
-                return df[df["state"] == state_filter].copy()
-            return df
-
+    def _parse_egrid(self) -> pd.DataFrame:
+        """Parse and standardize the plant sheet of the eGRID workbook."""
         filepath = self._download_egrid()
 
         logger.info("Parsing eGRID plant-level data...")
@@ -144,6 +214,11 @@ class EGRIDIngestor:
                 filepath,
                 sheet_name=EGRID_SHEETS["PLNT"],
                 header=1,  # Second row is the header
+                # Only parse the columns we keep; a callable tolerates
+                # columns missing from a given eGRID vintage
+                usecols=lambda col: col in PLANT_COLUMNS,
+                dtype=PLANT_DTYPES,
+                engine=_EXCEL_ENGINE,
             )
         except Exception as e:
             logger.error(f"Failed to parse eGRID Excel: {e}")
@@ -159,20 +234,69 @@ class EGRIDIngestor:
         }
         df = df[list(available_cols.keys())].rename(columns=available_cols)
 
-        # Clean numeric columns
-        numeric_cols = [
-            "nameplate_mw", "annual_gen_mwh", "annual_co2_tons",
-            "annual_nox_tons", "annual_so2_tons", "co2_rate_lb_mwh",
-            "nox_rate_lb_mwh", "so2_rate_lb_mwh", "heat_rate_btu_kwh",
-            "capacity_factor", "lat", "lon",
-        ]
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-
-        # Clean plant_id
+        numeric = [col for col in NUMERIC_PLANT_COLUMNS if col in df.columns]
+        df[numeric] = df[numeric].apply(pd.to_numeric, errors="coerce").astype("float64")
         if "plant_id" in df.columns:
             df["plant_id"] = pd.to_numeric(df["plant_id"], errors="coerce").astype("Int64")
+        return df
+
+    def load_egrid_data(
+        self,
+        state_filter: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Load plant-level data from the eGRID workbook.
+
+        Caches the parsed DataFrame, and its per-state slices, in memory for
+        repeated access; on disk, each state is also kept as its own shard
+        so a state-filtered call needn't load the national table. The
+        returned frame is shared — copy it before modifying.
+
+        Args:
+            state_filter: Two-letter state code or None for all
+
+        Returns:
+            DataFrame with standardized emissions and generation columns.
+        """
+        if self._plant_data is not None:
+            return self._state_view(state_filter)
+
+        # A single state can be served from its own shard without loading
+        # the national table
+        if state_filter and state_filter != "ALL":
+            shard = self._load_state_shard(state_filter)
+            if shard is not None:
+                return shard
+
+        # The parsed plant table is cached next to the workbook, keyed on
+        # the source file name so a new vintage invalidates it
+        plant_cache = self.cache_dir / f"{Path(EGRID_DOWNLOAD_URL).stem}_plant{CACHE_SUFFIX}"
+        df = None
+        if plant_cache.exists():
+            try:
+                df = read_cached_df(plant_cache)
+                logger.info(f"eGRID plant data cached at {plant_cache}")
+            except Exception as e:
+                logger.warning(f"Failed to read eGRID plant cache, re-parsing: {e}")
+
+        parsed = df is None
+        if parsed:
+            df = self._parse_egrid()
+            if df.empty:
+                return df
+
+        # Per-state slices, split once up front
+        by_state = (
+            dict(tuple(df.groupby("state", sort=False, observed=True)))
+            if "state" in df.columns else {}
+        )
+
+        if parsed:
+            atomic_write_df(plant_cache, df)
+            shard_dir = self._state_shard_dir()
+            shard_dir.mkdir(exist_ok=True)
+            for state, sub in by_state.items():
+                atomic_write_df(shard_dir / f"{state}{CACHE_SUFFIX}", sub)
 
         logger.info(f"Loaded {len(df)} plants from eGRID 2022")
 
@@ -188,11 +312,41 @@ class EGRIDIngestor:
         )
 
         self._plant_data = df
+        self._by_state = by_state
+        self._emission_cache = {}
+        # plant_id -> row position of its first occurrence, for O(1) lookups
+        plant_ids = df["plant_id"].tolist() if "plant_id" in df.columns else []
+        self._plant_index = {
+            pid: i for i, pid in reversed(list(enumerate(plant_ids))) if pd.notna(pid)
+        }
 
-        if state_filter and state_filter != "ALL":
-            return df[df["state"] == state_filter].copy()
+        return self._state_view(state_filter)
 
-        return df
+    def _state_shard_dir(self) -> Path:
+        """Directory of per-state plant table shards for the current vintage."""
+        return self.cache_dir / f"{Path(EGRID_DOWNLOAD_URL).stem}_plant_by_state"
+
+    def _load_state_shard(self, state: str) -> Optional[pd.DataFrame]:
+        """One state's plant rows from memory or its on-disk shard, if present."""
+        if state in self._by_state:
+            return self._by_state[state]
+        shard_file = self._state_shard_dir() / f"{state}{CACHE_SUFFIX}"
+        if not shard_file.exists():
+            return None
+        try:
+            shard = read_cached_df(shard_file)
+        except Exception as e:
+            logger.warning(f"Failed to read eGRID {state} shard: {e}")
+            return None
+        logger.info(f"Loaded {len(shard)} {state} plants from eGRID shard")
+        self._by_state[state] = shard
+        return shard
+
+    def _state_view(self, state_filter: Optional[str]) -> pd.DataFrame:
+        """Loaded plant data for one state, or all of it for None/"ALL"."""
+        if state_filter and state_filter != "ALL":
+            return self._by_state.get(state_filter, self._plant_data.iloc[0:0])
+        return self._plant_data
 
     def get_plant_emissions(self, plant_id: int) -> dict:
         """
@@ -205,27 +359,35 @@ class EGRIDIngestor:
         if df.empty or "plant_id" not in df.columns:
             return {"found": False}
 
-        match = df[df["plant_id"] == plant_id]
+        cached = self._emission_cache.get(plant_id)
+        if cached is not None:
+            return dict(cached)
 
-        if match.empty:
+        idx = self._plant_index.get(plant_id)
+
+        if idx is None:
             return {"found": False, "plant_id": plant_id}
 
-        row = match.iloc[0]
-        return {
+        # One namedtuple for the row; fields missing from this vintage
+        # fall back to the defaults
+        row = next(df.iloc[idx:idx + 1].itertuples(index=False))
+        profile = {
             "found": True,
             "plant_id": plant_id,
-            "plant_name": row.get("plant_name", ""),
-            "state": row.get("state", ""),
-            "primary_fuel": row.get("primary_fuel", ""),
-            "nameplate_mw": row.get("nameplate_mw", 0),
-            "annual_gen_mwh": row.get("annual_gen_mwh", 0),
-            "capacity_factor": row.get("capacity_factor", 0),
-            "co2_rate_lb_mwh": row.get("co2_rate_lb_mwh", 0),
-            "nox_rate_lb_mwh": row.get("nox_rate_lb_mwh", 0),
-            "so2_rate_lb_mwh": row.get("so2_rate_lb_mwh", 0),
-            "annual_co2_tons": row.get("annual_co2_tons", 0),
-            "egrid_subregion": row.get("egrid_subregion", ""),
+            "plant_name": getattr(row, "plant_name", ""),
+            "state": getattr(row, "state", ""),
+            "primary_fuel": getattr(row, "primary_fuel", ""),
+            "nameplate_mw": getattr(row, "nameplate_mw", 0),
+            "annual_gen_mwh": getattr(row, "annual_gen_mwh", 0),
+            "capacity_factor": getattr(row, "capacity_factor", 0),
+            "co2_rate_lb_mwh": getattr(row, "co2_rate_lb_mwh", 0),
+            "nox_rate_lb_mwh": getattr(row, "nox_rate_lb_mwh", 0),
+            "so2_rate_lb_mwh": getattr(row, "so2_rate_lb_mwh", 0),
+            "annual_co2_tons": getattr(row, "annual_co2_tons", 0),
+            "egrid_subregion": getattr(row, "egrid_subregion", ""),
         }
+        self._emission_cache[plant_id] = profile
+        return dict(profile)
 
     def enrich_eia_plants(
         self,
@@ -247,22 +409,22 @@ class EGRIDIngestor:
             return eia_plants
 
         # Select enrichment columns
-        enrich_cols = [
-            "plant_id", "annual_gen_mwh", "annual_co2_tons",
-            "co2_rate_lb_mwh", "nox_rate_lb_mwh", "so2_rate_lb_mwh",
-            "heat_rate_btu_kwh", "capacity_factor", "egrid_subregion",
-        ]
+        enrich_cols = ["plant_id", *ENRICH_FLOAT_COLUMNS, "egrid_subregion"]
         available = [c for c in enrich_cols if c in egrid_df.columns]
-        egrid_subset = egrid_df[available].drop_duplicates(subset=["plant_id"])
-
-        merged = eia_plants.merge(
-            egrid_subset,
-            left_on=plant_id_col,
-            right_on="plant_id",
-            how="left",
-            suffixes=("", "_egrid"),
+        # Index the de-duplicated subset on plant_id so the join probes that
+        # hash directly; enrichment metrics don't need float64 precision.
+        # plant_id stays a column too when the EIA key has another name.
+        egrid_subset = (
+            egrid_df[available]
+            .drop_duplicates(subset=["plant_id"])
+            .set_index("plant_id", drop=(plant_id_col == "plant_id"))
+            .astype({c: "float32" for c in ENRICH_FLOAT_COLUMNS if c in available})
         )
 
+        merged = eia_plants.join(
+            egrid_subset, on=plant_id_col, how="left", rsuffix="_egrid"
+        ).reset_index(drop=True)
+
         matched = merged["annual_co2_tons"].notna().sum() if "annual_co2_tons" in merged.columns else 0
         logger.info(
             f"eGRID enrichment: matched {matched}/{len(eia_plants)} plants "
@@ -292,21 +454,35 @@ class EGRIDIngestor:
         if "co2_rate_lb_mwh" not in df.columns:
             return {"clean": {}, "dirty": {}, "unknown": {"count": len(df)}}
 
-        clean = df[df["co2_rate_lb_mwh"] <= co2_threshold_lb_mwh]
-        dirty = df[df["co2_rate_lb_mwh"] > co2_threshold_lb_mwh]
-        unknown = df[df["co2_rate_lb_mwh"].isna()]
+        # Summed metrics; a column missing from the sheet reports 0
+        summed = {
+            "capacity_mw": "nameplate_mw",
+            "generation_mwh": "annual_gen_mwh",
+            "co2_tons": "annual_co2_tons",
+        }
+        present = {key: col in df.columns for key, col in summed.items()}
+        rate = df["co2_rate_lb_mwh"].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = np.column_stack([
+            df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            if present[key] else np.zeros(len(df))
+            for key, col in summed.items()
+        ])
+        totals = _bucket_totals(rate, values, float(co2_threshold_lb_mwh))
+        counts = totals[:, 0]
+        sums = {
+            key: totals[:, j + 1] if present[key] else None
+            for j, key in enumerate(summed)
+        }
 
-        def _summarize(subset):
-            return {
-                "count": len(subset),
-                "capacity_mw": round(subset["nameplate_mw"].sum(), 1) if "nameplate_mw" in subset.columns else 0,
-                "generation_mwh": round(subset["annual_gen_mwh"].sum(), 1) if "annual_gen_mwh" in subset.columns else 0,
-                "co2_tons": round(subset["annual_co2_tons"].sum(), 1) if "annual_co2_tons" in subset.columns else 0,
-            }
+        def _summarize(b):
+            summary = {"count": int(counts[b])}
+            for key, bucket_sums in sums.items():
+                summary[key] = round(bucket_sums[b], 1) if bucket_sums is not None else 0
+            return summary
 
         return {
-            "clean": _summarize(clean),
-            "dirty": _summarize(dirty),
-            "unknown": _summarize(unknown),
+            "clean": _summarize(0),
+            "dirty": _summarize(1),
+            "unknown": _summarize(2),
             "threshold_lb_mwh": co2_threshold_lb_mwh,
         }
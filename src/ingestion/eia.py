@@ -9,14 +9,20 @@ API docs: https://www.eia.gov/opendata/documentation.php
 Free API key: https://www.eia.gov/opendata/
 """
 
+import hashlib
 import logging
+from pathlib import Path
 from typing import Optional
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
 from shapely.geometry import Point
 
 from ..utils.api_client import APIClient
-from ..utils.geo import haversine_distance, WGS84
+from ..utils.cache import CACHE_SUFFIX, atomic_write_df, cache_age, read_cached_df
+from ..utils.geo import haversine_distance_vec, WGS84
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +32,14 @@ EIA_POWER_PLANTS_URL = (
     "US_Electric_Power_Plants/FeatureServer/0"
 )
 
+# Plant attributes used by get_nearby_power_plants — nothing else is fetched
+PLANT_OUT_FIELDS = "NAME,TOTAL_MW,PRIMSOURCE,TECH_DESC"
+
+# Grid density score by nearby capacity (MW); each edge is inclusive, so
+# 100 MW already scores 40 and 5000 MW is a major generation hub
+_CAP_BINS = np.array([100.0, 500.0, 1000.0, 5000.0])
+_CAP_SCORES = np.array([20, 40, 60, 80, 100])
+
 
 class EIAIngestor:
     """Ingests EIA power plant and grid data for BESS siting."""
@@ -38,6 +52,56 @@ class EIAIngestor:
             cache_enabled=config.get("cache", {}).get("enabled", True),
         )
         self.cache_hours = config.get("cache", {}).get("grid_data_expiry_hours", 720)
+        self.cache_enabled = config.get("cache", {}).get("enabled", True)
+        self.cache_dir = Path(
+            config.get("cache", {}).get("directory", "./data/cache")
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _query_plants(self, lat: float, lon: float, radius_miles: float) -> gpd.GeoDataFrame:
+        """
+        Plants within ``radius_miles`` of a point as a GeoDataFrame.
+
+        The converted frame is cached per query, so repeat lookups skip both
+        the request and the GeoJSON-to-geometry conversion.
+        """
+        from ..utils.api_client import ArcGISClient
+        from ..utils.geo import geojson_to_geodataframe
+
+        key = hashlib.md5(
+            f"{lat:.6f},{lon:.6f},{radius_miles}|{PLANT_OUT_FIELDS}".encode()
+        ).hexdigest()
+        cache_file = self.cache_dir / f"arcgis_plants_{key}{CACHE_SUFFIX}"
+        if (
+            self.cache_enabled
+            and cache_file.exists()
+            and cache_age(cache_file) < self.cache_hours * 3600
+        ):
+            try:
+                return read_cached_df(cache_file)
+            except Exception as e:
+                logger.warning(f"Failed to read EIA plant cache, re-querying: {e}")
+
+        arcgis = ArcGISClient(
+            cache_dir=str(self.cache_dir),
+            cache_enabled=self.cache_enabled,
+        )
+        geojson = arcgis.query_point_radius(
+            service_url=EIA_POWER_PLANTS_URL,
+            lat=lat,
+            lon=lon,
+            radius_miles=radius_miles,
+            out_fields=PLANT_OUT_FIELDS,
+            cache_hours=self.cache_hours,
+        )
+        gdf = geojson_to_geodataframe(geojson)
+        # GeoJSON properties arrive as Python objects (None for gaps); coerce
+        # once so capacity sums run on a plain float column
+        if "TOTAL_MW" in gdf.columns:
+            gdf["TOTAL_MW"] = pd.to_numeric(gdf["TOTAL_MW"], errors="coerce")
+        if self.cache_enabled and not gdf.empty:
+            atomic_write_df(cache_file, gdf)
+        return gdf
 
     def get_nearby_power_plants(
         self,
@@ -55,24 +119,8 @@ class EIAIngestor:
             - nearest_distance_mi: distance to closest plant
             - fuel_mix: dict of fuel type -> count
         """
-        from ..utils.api_client import ArcGISClient
-        from ..utils.geo import geojson_to_geodataframe
-
-        arcgis = ArcGISClient(
-            cache_dir=self.config.get("cache", {}).get("directory", "./data/cache"),
-            cache_enabled=self.config.get("cache", {}).get("enabled", True),
-        )
-
         try:
-            geojson = arcgis.query_point_radius(
-                service_url=EIA_POWER_PLANTS_URL,
-                lat=lat,
-                lon=lon,
-                radius_miles=radius_miles,
-                out_fields="NAME,NAICS_DESC,SOURCE,SOURCEDATE,LINES,MAX_VOLT,MIN_VOLT,"
-                "TOTAL_MW,NET_GEN,TECH_DESC,PRIMSOURCE",
-                cache_hours=self.cache_hours,
-            )
+            gdf = self._query_plants(lat, lon, radius_miles)
         except Exception as e:
             logger.warning(f"EIA power plant query failed: {e}")
             return {
@@ -83,8 +131,6 @@ class EIAIngestor:
                 "fuel_mix": {},
             }
 
-        gdf = geojson_to_geodataframe(geojson)
-
         if gdf.empty:
             return {
                 "count": 0,
@@ -94,38 +140,54 @@ class EIAIngestor:
                 "fuel_mix": {},
             }
 
-        # Calculate distances
-        distances = gdf.geometry.apply(
-            lambda g: haversine_distance(lat, lon, g.centroid.y, g.centroid.x)
+        # Calculate distances — centroids and haversine over whole arrays
+        centroids = shapely.centroid(gdf.geometry.to_numpy())
+        distances = haversine_distance_vec(
+            lat, lon, shapely.get_y(centroids), shapely.get_x(centroids)
         )
 
         # Build fuel mix
         fuel_col = "PRIMSOURCE" if "PRIMSOURCE" in gdf.columns else "TECH_DESC"
         fuel_mix = {}
         if fuel_col in gdf.columns:
-            fuel_mix = gdf[fuel_col].value_counts().to_dict()
+            values, counts = np.unique(gdf[fuel_col].dropna().to_numpy(), return_counts=True)
+            order = np.argsort(-counts, kind="stable")  # most common first
+            fuel_mix = dict(zip(values[order].tolist(), counts[order].tolist()))
 
         # Total capacity
         total_mw = 0
         if "TOTAL_MW" in gdf.columns:
             total_mw = gdf["TOTAL_MW"].sum()
 
-        plants = []
-        for idx, row in gdf.iterrows():
-            plants.append(
-                {
-                    "name": row.get("NAME", "Unknown"),
-                    "capacity_mw": row.get("TOTAL_MW", 0),
-                    "fuel": row.get(fuel_col, "Unknown"),
-                    "distance_mi": round(distances.iloc[idx] if idx < len(distances) else 0, 2),
-                }
-            )
+        # Ten nearest plants: partial selection, then order just those
+        k = min(10, len(distances))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+
+        # Plant entries are pulled straight from the column arrays
+        def _column(col, default):
+            if col in gdf.columns:
+                return gdf[col].to_numpy()
+            return np.full(len(gdf), default, dtype=object)
+
+        names = _column("NAME", "Unknown")
+        caps = _column("TOTAL_MW", 0)
+        fuels = _column(fuel_col, "Unknown")
+        plants = [
+            {
+                "name": names[i],
+                "capacity_mw": caps[i],
+                "fuel": fuels[i],
+                "distance_mi": round(float(distances[i]), 2),
+            }
+            for i in nearest
+        ]
 
         return {
             "count": len(gdf),
-            "plants": plants[:10],  # top 10 nearest
+            "plants": plants,
             "total_capacity_mw": round(total_mw, 1),
-            "nearest_distance_mi": round(distances.min(), 2) if len(distances) > 0 else None,
+            "nearest_distance_mi": round(distances[nearest[0]], 2),
             "fuel_mix": fuel_mix,
         }
 
@@ -146,18 +208,11 @@ class EIAIngestor:
         capacity = result["total_capacity_mw"]
         count = result["count"]
 
-        if capacity >= 5000:
-            score = 100  # Major generation hub
-        elif capacity >= 1000:
-            score = 80
-        elif capacity >= 500:
-            score = 60
-        elif capacity >= 100:
-            score = 40
-        elif count > 0:
-            score = 20
-        else:
+        if count == 0 and capacity < _CAP_BINS[0]:
             score = 5  # Remote area — could be good for BESS
+        else:
+            idx = np.searchsorted(_CAP_BINS, capacity, side="right")
+            score = int(_CAP_SCORES[idx])
 
         flags = []
         if count == 0:
@@ -16,14 +16,17 @@ API docs: https://www.eia.gov/opendata/documentation.php
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List
 
 import pandas as pd
 import geopandas as gpd
-from shapely.geometry import Point
+from shapely.geometry import box
 
 from ..utils.api_client import APIClient, ArcGISClient
-from ..utils.geo import geojson_to_geodataframe, haversine_distance, WGS84
+from ..utils.geo import (
+    geojson_to_geodataframe, haversine_distance_vec, point_buffer_bbox, WGS84,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +83,8 @@ FUEL_TYPE_MAP = {
     # Other
     "OTH": "Other", "WH": "Other", "PUR": "Other",
 }
+# Exact codes plus their lowercase forms, merged once so a lookup is one map
+_FUEL_LOOKUP = {**{k.lower(): v for k, v in FUEL_TYPE_MAP.items()}, **FUEL_TYPE_MAP}
 
 # EIA generator status codes
 STATUS_MAP = {
@@ -100,6 +105,38 @@ STATUS_MAP = {
     "OT": "Other",
 }
 
+# EIA API v2 generator fields -> standardized column names
+API_COLUMN_MAP = {
+    "plantid": "plant_id",
+    "plantName": "plant_name",
+    "stateid": "state",
+    "sector": "sector",
+    "entityName": "entity_name",
+    "nameplate-capacity-mw": "capacity_mw",
+    "status": "status_code",
+    "technology": "technology",
+    "energy_source_code": "fuel_code",
+    "balancing-authority-code": "ba_code",
+    "county": "county",
+    "latitude": "lat",
+    "longitude": "lon",
+    "operating-year-month": "operating_date",
+    "planned-retirement-year-month": "retirement_date",
+}
+
+# Standardized API columns stored as categoricals
+API_CATEGORY_COLUMNS = ("fuel_category", "status_code", "status_desc", "state", "ba_code")
+
+
+def _fuel_category(codes: pd.Series) -> pd.Series:
+    """
+    Normalize EIA fuel codes to clean category names — exact match first,
+    then lowercase; anything unmatched or missing becomes "Other".
+    """
+    codes = codes.astype("string").str.strip()
+    keys = codes.where(codes.isin(list(_FUEL_LOOKUP)), codes.str.lower())
+    return keys.map(_FUEL_LOOKUP).fillna("Other")
+
 
 class EIA860MIngestor:
     """
@@ -109,6 +146,7 @@ class EIA860MIngestor:
       - get_all_plants(): All operating plants nationwide (or by state)
       - get_planned_generators(): Planned/under-construction projects
       - get_plants_near_point(): Spatial query for plants near a coordinate
+      - get_plants_near_point_local(): Same, against an in-memory plant frame
       - categorize_by_fuel(): Fuel type breakdown
     """
 
@@ -126,14 +164,6 @@ class EIA860MIngestor:
         )
         self.cache_hours = config.get("cache", {}).get("grid_data_expiry_hours", 720)
 
-    def _normalize_fuel(self, fuel_code: str) -> str:
-        """Normalize EIA fuel codes to clean category names."""
-        if not fuel_code or pd.isna(fuel_code):
-            return "Other"
-        code = str(fuel_code).strip()
-        # Try exact match first, then lowercase
-        return FUEL_TYPE_MAP.get(code, FUEL_TYPE_MAP.get(code.lower(), "Other"))
-
     def _eia_api_request(
         self,
         endpoint: str,
@@ -163,9 +193,8 @@ class EIA860MIngestor:
         }
 
         if facets:
-            for i, (key, values) in enumerate(facets.items()):
-                for j, val in enumerate(values):
-                    params[f"facets[{key}][]"] = val if len(values) == 1 else values
+            for key, values in facets.items():
+                params[f"facets[{key}][]"] = list(values)
 
         if sort:
             for i, s in enumerate(sort):
@@ -178,6 +207,37 @@ class EIA860MIngestor:
             cache_hours=self.cache_hours,
         )
 
+    def _fetch_generator_page(self, params: dict, offset: int) -> dict:
+        """Fetch one page of generator records; returns {} if the request fails."""
+        try:
+            data = self.client.get(
+                EIA_OPGEN_ENDPOINT,
+                params={**params, "offset": offset},
+                cache_hours=self.cache_hours,
+                timeout=90,  # explicit 90s timeout for EIA
+            )
+        except Exception as e:
+            logger.error(f"EIA API request failed: {e}")
+            return {}
+        return data.get("response", {})
+
+    @staticmethod
+    def _extend_pages(all_records: list, pages, page_size: int) -> bool:
+        """
+        Append page records in order until an empty or short page.
+
+        Returns True if every page came back full (more may remain).
+        """
+        for page in pages:
+            records = page.get("data", [])
+            if not records:
+                return False
+            all_records.extend(records)
+            logger.info(f"  Retrieved {len(records)} records (total: {len(all_records)})")
+            if len(records) < page_size:
+                return False
+        return True
+
     def get_all_plants_arcgis(
         self,
         state_filter: Optional[str] = None,
@@ -228,7 +288,7 @@ class EIA860MIngestor:
 
         # Normalize fuel type
         fuel_col = "PRIMSOURCE" if "PRIMSOURCE" in gdf.columns else "TECH_DESC"
-        gdf["fuel_category"] = gdf[fuel_col].apply(self._normalize_fuel)
+        gdf["fuel_category"] = _fuel_category(gdf[fuel_col])
 
         # Clean capacity
         if "TOTAL_MW" in gdf.columns:
@@ -241,9 +301,12 @@ class EIA860MIngestor:
             f"({gdf['capacity_mw'].sum():,.0f} MW total capacity)"
         )
 
-        # Log fuel mix
-        fuel_summary = gdf.groupby("fuel_category")["capacity_mw"].sum().sort_values(ascending=False)
-        logger.info(f"Fuel mix (MW):\n{fuel_summary.to_string()}")
+        # Log fuel mix — only built when INFO is actually emitted
+        if logger.isEnabledFor(logging.INFO):
+            fuel_summary = (
+                gdf.groupby("fuel_category", sort=False)["capacity_mw"].sum().nlargest(12)
+            )
+            logger.info(f"Fuel mix (MW):\n{fuel_summary.to_string()}")
 
         return gdf
 
@@ -279,99 +342,68 @@ class EIA860MIngestor:
             f"(statuses: {include_statuses})..."
         )
 
-        all_records = []
-        offset = 0
         page_size = 5000
         max_pages = 20  # Safety limit: 20 pages × 5000 = 100K records max
-        page_count = 0
 
-        while True:
-            page_count += 1
-            if page_count > max_pages:
-                logger.warning(
-                    f"  EIA pagination hit max_pages={max_pages} "
-                    f"({len(all_records)} records). Stopping."
-                )
-                break
-
-            params = {
-                "api_key": self.api_key,
-                "frequency": "monthly",
-                "data[0]": "nameplate-capacity-mw",
-                "sort[0][column]": "nameplate-capacity-mw",
-                "sort[0][direction]": "desc",
-                "length": page_size,
-                "offset": offset,
-            }
-
-            if state_filter and state_filter != "ALL":
-                params["facets[stateid][]"] = state_filter
-
-            for status in include_statuses:
-                params.setdefault("facets[status][]", [])
-                if isinstance(params["facets[status][]"], list):
-                    params["facets[status][]"].append(status)
-                else:
-                    params["facets[status][]"] = [params["facets[status][]"], status]
-
-            try:
-                data = self.client.get(
-                    EIA_OPGEN_ENDPOINT,
-                    params=params,
-                    cache_hours=self.cache_hours,
-                    timeout=90,  # explicit 90s timeout for EIA
-                )
-            except Exception as e:
-                logger.error(f"EIA API request failed: {e}")
-                break
+        params = {
+            "api_key": self.api_key,
+            "frequency": "monthly",
+            "data[0]": "nameplate-capacity-mw",
+            "sort[0][column]": "nameplate-capacity-mw",
+            "sort[0][direction]": "desc",
+            "length": page_size,
+        }
 
-            records = data.get("response", {}).get("data", [])
-            if not records:
-                break
+        if state_filter and state_filter != "ALL":
+            params["facets[stateid][]"] = state_filter
 
-            all_records.extend(records)
-            logger.info(f"  Retrieved {len(records)} records (total: {len(all_records)})")
+        # requests repeats the key once per status in the query string
+        if include_statuses:
+            params["facets[status][]"] = list(include_statuses)
 
-            # Check if more pages
-            total = data.get("response", {}).get("total", 0)
-            if len(all_records) >= total or len(records) < page_size:
-                break
+        # First page tells us how many records there are
+        response = self._fetch_generator_page(params, 0)
+        all_records = list(response.get("data", []))
+        if all_records:
+            logger.info(f"  Retrieved {len(all_records)} records (total: {len(all_records)})")
 
-            offset += page_size
+        total = int(response.get("total") or 0)
+        if len(all_records) == page_size and total > page_size:
+            if total > max_pages * page_size:
+                logger.warning(
+                    f"  EIA pagination hit max_pages={max_pages} "
+                    f"({total} records available). Fetching the first "
+                    f"{max_pages * page_size}."
+                )
+            offsets = range(page_size, min(total, max_pages * page_size), page_size)
+
+            # Remaining pages in parallel — few workers to stay clear of 429s.
+            # map keeps offset order, so the capacity sort survives
+            with ThreadPoolExecutor(max_workers=3) as ex:
+                pages = ex.map(lambda off: self._fetch_generator_page(params, off), offsets)
+                self._extend_pages(all_records, pages, page_size)
+        elif len(all_records) == page_size and not total:
+            # No total reported — walk pages one at a time while they come back full
+            offsets = range(page_size, max_pages * page_size, page_size)
+            pages = (self._fetch_generator_page(params, off) for off in offsets)
+            if self._extend_pages(all_records, pages, page_size):
+                logger.warning(
+                    f"  EIA pagination hit max_pages={max_pages} "
+                    f"({len(all_records)} records). Stopping."
+                )
 
         if not all_records:
             logger.warning("No generator records from EIA API")
             return pd.DataFrame()
 
-        df = pd.DataFrame(all_records)
+        # Renamed in one pass; fields outside the map keep their API names
+        df = pd.DataFrame(all_records).rename(columns=API_COLUMN_MAP)
         logger.info(f"Retrieved {len(df)} generator records from EIA API v2")
 
-        # Normalize columns
-        col_map = {
-            "plantid": "plant_id",
-            "plantName": "plant_name",
-            "stateid": "state",
-            "sector": "sector",
-            "entityName": "entity_name",
-            "nameplate-capacity-mw": "capacity_mw",
-            "status": "status_code",
-            "technology": "technology",
-            "energy_source_code": "fuel_code",
-            "balancing-authority-code": "ba_code",
-            "county": "county",
-            "latitude": "lat",
-            "longitude": "lon",
-            "operating-year-month": "operating_date",
-            "planned-retirement-year-month": "retirement_date",
-        }
-        for old, new in col_map.items():
-            if old in df.columns:
-                df.rename(columns={old: new}, inplace=True)
-
         # Normalize fuel
         fuel_col = "fuel_code" if "fuel_code" in df.columns else "technology"
         if fuel_col in df.columns:
-            df["fuel_category"] = df[fuel_col].apply(self._normalize_fuel)
+            df["fuel_category"] = _fuel_category(df[fuel_col])
         else:
             df["fuel_category"] = "Other"
 
@@ -383,6 +415,11 @@ class EIA860MIngestor:
         if "capacity_mw" in df.columns:
             df["capacity_mw"] = pd.to_numeric(df["capacity_mw"], errors="coerce").fillna(0)
 
+        # Low-cardinality labels repeated across every generator row
+        for col in API_CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+
         return df
 
     def get_all_plants(
@@ -416,7 +453,7 @@ class EIA860MIngestor:
             logger.info("Using EIA API data only (ArcGIS failed)")
             if "lat" in api_df.columns and "lon" in api_df.columns:
                 api_df = api_df.dropna(subset=["lat", "lon"])
-                geometry = [Point(row.lon, row.lat) for _, row in api_df.iterrows()]
+                geometry = gpd.points_from_xy(api_df["lon"], api_df["lat"])
                 return gpd.GeoDataFrame(api_df, geometry=geometry, crs=WGS84)
             return gpd.GeoDataFrame()
 
@@ -473,20 +510,47 @@ class EIA860MIngestor:
         gdf["lon"] = gdf.geometry.x
 
         # Add distance
-        gdf["distance_mi"] = gdf.apply(
-            lambda row: haversine_distance(lat, lon, row.lat, row.lon),
-            axis=1,
+        gdf["distance_mi"] = haversine_distance_vec(
+            lat, lon, gdf["lat"].to_numpy(), gdf["lon"].to_numpy()
         )
 
         # Normalize fuel
         fuel_col = "PRIMSOURCE" if "PRIMSOURCE" in gdf.columns else "TECH_DESC"
-        gdf["fuel_category"] = gdf[fuel_col].apply(self._normalize_fuel)
+        gdf["fuel_category"] = _fuel_category(gdf[fuel_col])
 
         if "TOTAL_MW" in gdf.columns:
             gdf["capacity_mw"] = pd.to_numeric(gdf["TOTAL_MW"], errors="coerce").fillna(0)
 
         return gdf.sort_values("distance_mi")
 
+    @staticmethod
+    def get_plants_near_point_local(
+        gdf: gpd.GeoDataFrame,
+        lat: float,
+        lon: float,
+        radius_miles: float = 25.0,
+    ) -> gpd.GeoDataFrame:
+        """
+        Plants within a radius of a point, from a GeoDataFrame already in
+        memory (e.g. get_all_plants) — no server round trip.
+
+        The spatial index narrows the frame to plants inside the radius'
+        bounding box; exact haversine distances run on those only.
+        """
+        if gdf.empty:
+            return gdf
+
+        bbox = box(*point_buffer_bbox(lat, lon, radius_miles))
+        candidates = gdf.iloc[gdf.sindex.query(bbox, predicate="intersects")].copy()
+        if candidates.empty:
+            return candidates
+
+        candidates["distance_mi"] = haversine_distance_vec(
+            lat, lon, candidates.geometry.y.to_numpy(), candidates.geometry.x.to_numpy()
+        )
+        nearby = candidates[candidates["distance_mi"] <= radius_miles]
+        return nearby.sort_values("distance_mi")
+
     @staticmethod
     def categorize_by_fuel(plants_df: pd.DataFrame) -> dict:
         """
@@ -502,7 +566,7 @@ class EIA860MIngestor:
         summary = {}
         total_mw = plants_df[cap_col].sum() if cap_col in plants_df.columns else 0
 
-        for fuel, group in plants_df.groupby("fuel_category"):
+        for fuel, group in plants_df.groupby("fuel_category", observed=True):
             mw = group[cap_col].sum() if cap_col in group.columns else 0
             summary[fuel] = {
                 "count": len(group),
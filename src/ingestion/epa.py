@@ -6,12 +6,16 @@ and ECHO (Enforcement & Compliance) for environmental screening.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
 
 from ..utils.api_client import ArcGISClient, EPAClient, ECHOClient
-from ..utils.geo import geojson_to_geodataframe, haversine_distance
+from ..utils.geo import geojson_to_geodataframe, haversine_distance_vec
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +35,9 @@ EPA_SERVICES = {
     },
 }
 
+# ECHO per-program compliance status fields checked for significant violations
+ECHO_STATUS_FIELDS = ("CWAStatus", "RCRAStatus", "CAASstatus")
+
 # Note: Some EPA ArcGIS services may have different or updated URLs.
 # The ECHO API is the most reliable for radius-based facility searches.
 
@@ -172,19 +179,29 @@ class EPAIngestor:
             "eliminate": False,
         }
 
-        # 1. Superfund / NPL
         npl_radius = self.epa_config.get("npl_radius", 1.0)
-        superfund = self.search_superfund(lat, lon, npl_radius)
+        bf_radius = self.epa_config.get("brownfields_radius", 0.5)
+
+        # The four lookups are independent network calls — run them together
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            superfund_fut = ex.submit(self.search_superfund, lat, lon, npl_radius)
+            brownfields_fut = ex.submit(self.search_brownfields, lat, lon, bf_radius)
+            tri_fut = ex.submit(self.search_tri, lat, lon, radius_miles=1.0)
+            echo_fut = ex.submit(self.search_echo_facilities, lat, lon, radius_miles=1.0)
+
+        # 1. Superfund / NPL
+        superfund = superfund_fut.result()
         if not superfund.empty:
             results["superfund"]["count"] = len(superfund)
             results["superfund"]["sites"] = superfund.get("SITE_NAME", superfund.index).tolist()
 
             # Calculate nearest distance
             if "geometry" in superfund.columns:
-                distances = superfund.geometry.apply(
-                    lambda g: haversine_distance(lat, lon, g.centroid.y, g.centroid.x)
+                centroids = shapely.centroid(superfund.geometry.to_numpy())
+                distances = haversine_distance_vec(
+                    lat, lon, shapely.get_y(centroids), shapely.get_x(centroids)
                 )
-                results["superfund"]["nearest_distance_mi"] = round(distances.min(), 2)
+                results["superfund"]["nearest_distance_mi"] = round(np.nanmin(distances), 2)
 
             if results["superfund"]["nearest_distance_mi"] and results["superfund"]["nearest_distance_mi"] < 0.25:
                 results["risk_flags"].append(
@@ -197,8 +214,7 @@ class EPAIngestor:
                 )
 
         # 2. Brownfields
-        bf_radius = self.epa_config.get("brownfields_radius", 0.5)
-        brownfields = self.search_brownfields(lat, lon, bf_radius)
+        brownfields = brownfields_fut.result()
         if not brownfields.empty:
             results["brownfields"]["count"] = len(brownfields)
             results["risk_flags"].append(
@@ -206,7 +222,7 @@ class EPAIngestor:
             )
 
         # 3. TRI
-        tri = self.search_tri(lat, lon, radius_miles=1.0)
+        tri = tri_fut.result()
         if not tri.empty:
             results["tri"]["count"] = len(tri)
             results["risk_flags"].append(
@@ -215,18 +231,14 @@ class EPAIngestor:
 
         # 4. ECHO comprehensive search
         try:
-            echo_data = self.search_echo_facilities(lat, lon, radius_miles=1.0)
+            echo_data = echo_fut.result()
             if echo_data and "Results" in echo_data:
                 facilities = echo_data["Results"].get("Facilities", [])
                 results["echo_summary"]["total_facilities"] = len(facilities)
 
                 # Count significant violations
-                sig_violations = sum(
-                    1 for f in facilities
-                    if f.get("CWAStatus") == "Significant Violation"
-                    or f.get("RCRAStatus") == "Significant Violation"
-                    or f.get("CAASstatus") == "Significant Violation"
-                )
+                statuses = pd.DataFrame(facilities, columns=list(ECHO_STATUS_FIELDS))
+                sig_violations = int(statuses.eq("Significant Violation").any(axis=1).sum())
                 results["echo_summary"]["significant_violations"] = sig_violations
 
                 if sig_violations > 0:
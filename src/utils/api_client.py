@@ -7,6 +7,8 @@ import time
 import json
 import hashlib
 import logging
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 from urllib.parse import urlencode
@@ -18,6 +20,30 @@ from urllib3.util.retry import Retry
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _shared_session() -> requests.Session:
+    """Build the process-wide session with retry and connection pooling."""
+    session = requests.Session()
+    # Reduced retries to prevent long hangs
+    retry_strategy = Retry(
+        total=2,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        connect=2,
+        read=2,
+    )
+    # Sized for clients fanning requests out across threads
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy, pool_connections=32, pool_maxsize=32
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": "BESS-Site-Scout/1.0 (ReDewable Energy Internal Tool)"
+    })
+    return session
+
+
 class APIClient:
     """Base HTTP client with caching and retry logic."""
 
@@ -26,24 +52,13 @@ class APIClient:
         self.cache_enabled = cache_enabled
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # Setup session with retry (reduced retries to prevent long hangs)
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=2,
-            backoff_factor=0.5,
-            status_forcelist=[429, 500, 502, 503, 504],
-            connect=2,
-            read=2,
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
-        self.session.headers.update({
-            "User-Agent": "BESS-Site-Scout/1.0 (ReDewable Energy Internal Tool)"
-        })
+        # Every client shares one pooled session, so keep-alive connections
+        # carry over between ingestors and client types
+        self.session = _shared_session()
 
         # Rate limiting
         self._last_request_time = 0
+        self._rate_lock = threading.Lock()
         self._min_request_interval = 0.25  # 4 requests/sec max
 
     def _cache_key(self, url: str, params: dict) -> str:
@@ -73,11 +88,17 @@ class APIClient:
             json.dump(data, f)
 
     def _rate_limit(self):
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self._min_request_interval:
-            time.sleep(self._min_request_interval - elapsed)
-        self._last_request_time = time.time()
+        """
+        Enforce rate limiting between requests.
+
+        The lock is held through the sleep, so threads sharing a client
+        are spaced out one interval apart instead of all waking together.
+        """
+        with self._rate_lock:
+            elapsed = time.time() - self._last_request_time
+            if elapsed < self._min_request_interval:
+                time.sleep(self._min_request_interval - elapsed)
+            self._last_request_time = time.time()
 
     def get(
         self,
@@ -117,6 +138,22 @@ class APIClient:
         response.raise_for_status()
         return response.text
 
+    def get_response(self, url: str, timeout: int = 30, **kwargs) -> requests.Response:
+        """Make a rate-limited GET and return the response as-is (no caching)."""
+        self._rate_limit()
+        return self.session.get(url, timeout=timeout, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_client(cache_dir: str = "./data/cache", cache_enabled: bool = True) -> APIClient:
+    """
+    Return the shared APIClient for a cache directory.
+
+    Ingestors built from the same config reuse one session, so keep-alive
+    connections to ISO endpoints carry over between them.
+    """
+    return APIClient(cache_dir=cache_dir, cache_enabled=cache_enabled)
+
 
 class ArcGISClient(APIClient):
     """
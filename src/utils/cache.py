@@ -0,0 +1,70 @@
+"""
+Helpers for the DataFrame files ingestors keep in the cache directory.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+# Cached frames are pickled so a cache hit skips CSV parsing and dtype
+# inference; CSV caches written by older versions are still read.
+CACHE_SUFFIX = ".pkl"
+LEGACY_CACHE_SUFFIX = ".csv"
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    """Return the process-wide lock serializing writes to ``path``."""
+    key = os.path.abspath(path)
+    with _path_locks_guard:
+        lock = _path_locks.get(key)
+        if lock is None:
+            lock = _path_locks[key] = threading.Lock()
+        return lock
+
+
+def atomic_write_df(path: Path, df: pd.DataFrame) -> None:
+    """
+    Write a DataFrame cache file atomically.
+
+    The frame is written to a ``.tmp`` sibling and moved into place with
+    ``os.replace``, so readers only ever see a complete file; a per-path
+    lock keeps concurrent writers in this process from sharing the temp
+    file. The format follows the suffix: ``.csv`` or pickle otherwise.
+    """
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with _lock_for(path):
+        if path.suffix == ".csv":
+            df.to_csv(tmp, index=False)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, path)
+
+
+def existing_cache(cache_file: Path) -> Optional[Path]:
+    """Return the cache file on disk for ``cache_file``, preferring the pickle."""
+    if cache_file.exists():
+        return cache_file
+    legacy = cache_file.with_suffix(LEGACY_CACHE_SUFFIX)
+    if legacy.exists():
+        return legacy
+    return None
+
+
+def cache_age(path: Path) -> float:
+    """Seconds since ``path`` was last written."""
+    return time.time() - path.stat().st_mtime
+
+
+def read_cached_df(path: Path, **read_csv_kwargs) -> pd.DataFrame:
+    """Load a cached frame in either the current or the legacy CSV format."""
+    if path.suffix == LEGACY_CACHE_SUFFIX:
+        return pd.read_csv(path, **read_csv_kwargs)
+    return pd.read_pickle(path)
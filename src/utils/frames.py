@@ -0,0 +1,58 @@
+"""
+Helpers for the per-day reports ingestors download: which days to fetch,
+the CSV engine to parse them with, and combining the resulting frames.
+"""
+
+from datetime import datetime
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  optional — multi-threaded C parser for read_csv
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+
+def report_dates(count: int) -> List[str]:
+    """The last ``count`` days as ``YYYYMMDD`` strings, today first."""
+    if count <= 0:
+        return []
+    days = pd.date_range(end=datetime.now().date(), periods=count, freq="D")
+    return days[::-1].strftime("%Y%m%d").tolist()
+
+
+def concat_days(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate per-day report frames on one fixed column layout.
+
+    When every day has the same columns and plain NumPy dtypes, each output
+    column is built with a single ``np.concatenate`` instead of going
+    through ``pd.concat``'s block re-indexing. Otherwise reports that add or
+    drop a column between days are aligned to the union of columns (in
+    first-seen order) and concatenated, so the output layout does not
+    depend on which days were fetched.
+    """
+    if not frames:
+        return pd.DataFrame()
+
+    first = frames[0]
+    columns = list(first.columns)
+    same_schema = first.columns.is_unique and all(
+        list(f.columns) == columns and f.dtypes.equals(first.dtypes)
+        for f in frames[1:]
+    )
+    if same_schema and all(isinstance(dt, np.dtype) for dt in first.dtypes):
+        return pd.DataFrame(
+            {col: np.concatenate([f[col].to_numpy() for f in frames]) for col in columns},
+            columns=columns,
+        )
+
+    columns = list(dict.fromkeys(col for f in frames for col in f.columns))
+    aligned = [
+        f if list(f.columns) == columns else f.reindex(columns=columns)
+        for f in frames
+    ]
+    return pd.concat(aligned, ignore_index=True)
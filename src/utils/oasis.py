@@ -0,0 +1,43 @@
+"""
+Helpers for CAISO OASIS SingleZip responses (a zip holding one CSV).
+"""
+
+import csv
+import io
+import tempfile
+import zipfile
+from typing import Collection, Optional
+
+import pandas as pd
+
+# Archives are spooled in memory up to this size, then on disk
+ZIP_SPOOL_MAX_BYTES = 16 * 1024 * 1024
+ZIP_CHUNK_BYTES = 64 * 1024
+
+
+def read_zipped_csv(
+    response, columns: Optional[Collection[str]] = None, **read_csv_kwargs
+) -> pd.DataFrame:
+    """
+    Parse the first CSV entry of a zip response without buffering it twice.
+
+    ``response`` should come from ``session.get(..., stream=True)``. The body
+    is spooled as it arrives (zipfile needs a seekable file), and read_csv
+    then streams the entry straight out of the decompressor.
+
+    ``columns`` restricts parsing to those of the given names that the
+    report actually has. OASIS report layouts vary by query version, so the
+    header is checked first rather than failing on an absent column.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_BYTES) as buf:
+        for chunk in response.iter_content(chunk_size=ZIP_CHUNK_BYTES):
+            buf.write(chunk)
+        buf.seek(0)
+        with zipfile.ZipFile(buf) as z:
+            name = z.namelist()[0]
+            if columns is not None:
+                with z.open(name) as f:
+                    header = next(csv.reader(io.TextIOWrapper(f, encoding="utf-8")), [])
+                read_csv_kwargs["usecols"] = [c for c in header if c in columns]
+            with z.open(name) as f:
+                return pd.read_csv(f, **read_csv_kwargs)